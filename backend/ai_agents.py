@@ -2,16 +2,238 @@
 AI agents for resume processing with STRICT SAFETY RULES.
 These agents are ASSISTIVE ONLY - they suggest drafts, never finalize anything.
 """
+import atexit
+import codecs
+import heapq
 import json
 import hashlib
+import multiprocessing
+import os
+import re
+import threading
 import pdfplumber
 import io
-from typing import Dict, Any, Optional, Tuple, List
+from collections import OrderedDict
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Dict, Any, Optional, Tuple, List, Union
 
 
-def generate_resume_hash(resume_text: str) -> str:
-    """Generate SHA256 hash of resume text."""
-    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+# Precompiled patterns used by the extractors below
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_PHONE_IN_LINE_RE = re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+_LOC_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+)\b')
+_EMAIL_NAME_SPLIT_RE = re.compile(r'[._-]')
+_INSTITUTION_RE = re.compile(
+    r'([A-Z][^.]*?(?:University|Institute|College|School)[^.]*?)(?:\s+Expected|\s+Current|\s+Bachelor|\s+Master|\s+PhD|$)',
+    re.IGNORECASE
+)
+
+# Degree/field keywords -> canonical value, in priority order (first hit wins)
+_DEGREE_MAP = {
+    'bachelor': "Bachelor's Degree", 'b.tech': "Bachelor's Degree", 'b.s.': "Bachelor's Degree",
+    'b.a.': "Bachelor's Degree", 'bs ': "Bachelor's Degree", 'ba ': "Bachelor's Degree",
+    'master': "Master's Degree", 'm.s.': "Master's Degree", 'm.a.': "Master's Degree",
+    'ms ': "Master's Degree", 'ma ': "Master's Degree",
+    'phd': "PhD", 'ph.d.': "PhD", 'doctorate': "PhD",
+}
+_FIELD_MAP = {
+    'computer science': "Computer Science",
+    'software engineering': "Software Engineering",
+    'mining engineering': "Mining Engineering",
+    'electrical engineering': "Electrical Engineering",
+    'mechanical engineering': "Mechanical Engineering",
+    'engineering': "Engineering",
+    'business': "Business",
+    'mathematics': "Mathematics",
+}
+_DEGREE_RE = re.compile('|'.join(re.escape(keyword) for keyword in _DEGREE_MAP))
+_FIELD_RE = re.compile('|'.join(re.escape(keyword) for keyword in _FIELD_MAP))
+_SKILLS_HEADER_RE = re.compile(r'technical skills|skills:|technologies:|programming languages:')
+_STOP_SECTION_RE = re.compile(r'achievements|social engagements|experience|education|projects|work')
+# Skills find_skills_in_context looks for anywhere in the resume, in output order
+_CONTEXT_SKILLS = (
+    "python", "javascript", "java", "c++", "c#", "go", "rust", "php", "ruby", "swift",
+    "react", "angular", "vue", "node.js", "express", "django", "flask", "fastapi",
+    "sql", "mysql", "postgresql", "mongodb", "redis", "sqlite",
+    "aws", "azure", "gcp", "docker", "kubernetes", "git", "github",
+    "html", "css", "typescript", "graphql", "rest", "api",
+    "tensorflow", "pytorch", "pandas", "numpy", "scikit-learn",
+    "linux", "bash", "jenkins", "ci/cd"
+)
+_SKILL_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+_CONTEXT_SKILL_TOKENS = frozenset(s for s in _CONTEXT_SKILLS if _SKILL_TOKEN_RE.fullmatch(s))
+# Skills containing separators never survive tokenizing, so match them directly
+_CONTEXT_SKILL_RESIDUAL_RE = re.compile(
+    r'(?<![a-z0-9])(' + '|'.join(re.escape(s) for s in _CONTEXT_SKILLS if s not in _CONTEXT_SKILL_TOKENS) + r')(?![a-z0-9])'
+)
+# Keywords that classify a line inside extract_internships_for_user_profile
+_INTERNSHIP_LINE_RE = re.compile(
+    r'(?P<header>experience|internships)|(?P<stop>projects|education|skills)|(?P<role>intern|engineer|developer|analyst)'
+)
+# Separators in a skills section, all mapped to a space in one translate() pass
+_SKILL_SEP_TABLE = str.maketrans({',': ' ', ';': ' ', '|': ' ', '•': ' ', ':': ' ', '&': ' '})
+_MULTI_WORD_SKILLS = frozenset({
+    "machine learning", "data science", "web development", "software engineering",
+    "computer science", "artificial intelligence", "data analysis", "project management",
+    "data structures", "rest apis", "version control"
+})
+_NON_SKILL_WORDS = frozenset({
+    'and', 'the', 'with', 'for', 'experience', 'years', 'including',
+    'languages', 'core', 'cs', 'web', 'tools', 'libraries', 'basic', 'concepts'
+})
+# Alternate spellings accepted when matching project skills against the skill vocab
+_PROJECT_SKILL_ALIASES = {
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "javascript": ("js",),
+}
+_URL_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'https?://github\.com/[^\s]+',
+        r'https?://[^\s]*\.github\.io[^\s]*',
+        r'https?://[^\s]*portfolio[^\s]*',
+        r'https?://[^\s]*demo[^\s]*'
+    )
+]
+
+
+@dataclass
+class ResumeCtx:
+    """Resume text plus its lowercased form and lines, computed once per resume."""
+    text: str
+    text_lower: str
+    lines: List[str]
+    lines_lower: List[str]
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResumeCtx":
+        text_lower = text.lower()
+        return cls(
+            text=text,
+            text_lower=text_lower,
+            lines=text.split('\n'),
+            lines_lower=text_lower.split('\n')
+        )
+
+    @cached_property
+    def content_lines(self) -> List[Tuple[str, str]]:
+        """Non-blank lines as (stripped line, stripped lowercased line) pairs."""
+        return [
+            (line.strip(), line_lower.strip())
+            for line, line_lower in zip(self.lines, self.lines_lower)
+            if line.strip()
+        ]
+
+
+_HASH_CHUNK_SIZE = 64 * 1024
+
+
+def _hash_bytes(data: bytes) -> str:
+    """SHA256 hex digest of data, fed to the hasher in 64 KiB chunks."""
+    if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+        return hashlib.file_digest(io.BytesIO(data), 'sha256').hexdigest()
+    
+    digest = hashlib.sha256()
+    view = memoryview(data)
+    for start in range(0, len(view), _HASH_CHUNK_SIZE):
+        digest.update(view[start:start + _HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def generate_resume_hash(resume_text: Union[str, bytes]) -> str:
+    """Generate SHA256 hash of resume text, or of raw file bytes as uploaded."""
+    if isinstance(resume_text, bytes):
+        return _hash_bytes(resume_text)
+    return _hash_bytes(resume_text.encode('utf-8'))
+
+
+# Extracted text of recently uploaded files, keyed by "<kind>:<sha256 of raw bytes>"
+# (extraction runs in the threadpool, so the cache is shared between threads)
+_EXTRACTED_TEXT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_EXTRACTED_TEXT_CACHE_LOCK = threading.Lock()
+_EXTRACTED_TEXT_CACHE_SIZE = 256
+
+
+def _get_cached_text(cache_key: str) -> Optional[str]:
+    """Return previously extracted text for this file, if still cached."""
+    with _EXTRACTED_TEXT_CACHE_LOCK:
+        text = _EXTRACTED_TEXT_CACHE.get(cache_key)
+        if text is not None:
+            _EXTRACTED_TEXT_CACHE.move_to_end(cache_key)
+    return text
+
+
+def _cache_text(cache_key: str, text: str) -> None:
+    """Remember extracted text, evicting the least recently used entry."""
+    with _EXTRACTED_TEXT_CACHE_LOCK:
+        _EXTRACTED_TEXT_CACHE[cache_key] = text
+        _EXTRACTED_TEXT_CACHE.move_to_end(cache_key)
+        if len(_EXTRACTED_TEXT_CACHE) > _EXTRACTED_TEXT_CACHE_SIZE:
+            _EXTRACTED_TEXT_CACHE.popitem(last=False)
+
+
+# Draft profiles (JSON-encoded) of recently seen resumes, keyed by resume hash
+_PROFILE_CACHE: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 128
+_MIN_RESUME_TEXT_LENGTH = 50
+
+
+# Shared worker pool for multi-page PDFs (created on first use, shut down at exit)
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+_PDF_MAX_WORKERS = 4
+_PDF_SERIAL_MAX_PAGES = 2
+
+
+def _get_max_workers() -> int:
+    """Number of worker processes to use for PDF page extraction."""
+    return max(1, min(os.cpu_count() or 1, _PDF_MAX_WORKERS))
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            # "spawn" rather than the Linux default "fork": the server process is multithreaded
+            # (uvicorn, scheduler, threadpools), and forking it can copy locks held by other threads
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=_get_max_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PDF_POOL
+
+
+def shutdown_pdf_pool():
+    """Shut down the PDF worker pool, if it was started (app shutdown and interpreter exit)."""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        pool, _PDF_POOL = _PDF_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_pdf_pool)
+
+
+def _extract_pages_text(pages) -> str:
+    """Concatenate the extracted text of the given pdfplumber pages."""
+    parts: List[str] = []
+    for page in pages:
+        page_text = page.extract_text()
+        if page_text:
+            parts.append(page_text)
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _extract_page_range(content: bytes, start: int, end: int) -> str:
+    """Extract text from pages [start, end) of a PDF. Runs in a worker process."""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return _extract_pages_text(pdf.pages[start:end])
 
 
 def extract_text_from_pdf_pdfplumber(content: bytes) -> str:
@@ -23,19 +245,38 @@ def extract_text_from_pdf_pdfplumber(content: bytes) -> str:
     - No AI parsing of PDFs
     - No OCR unless explicitly needed
     - Return raw text only
+    
+    Re-uploads of the same file are served from an in-memory cache.
     """
+    cache_key = f"pdf:{generate_resume_hash(content)}"
+    cached_text = _get_cached_text(cache_key)
+    if cached_text is not None:
+        return cached_text
+    
     try:
         with pdfplumber.open(io.BytesIO(content)) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            if not text.strip():
-                raise ValueError("No text could be extracted from PDF")
-                
-            return text.strip()
+            page_count = len(pdf.pages)
+            max_workers = _get_max_workers()
+            if page_count <= _PDF_SERIAL_MAX_PAGES or max_workers == 1:
+                text = _extract_pages_text(pdf.pages)
+            else:
+                text = None
+        
+        # Larger documents: split pages into contiguous blocks, one per worker
+        if text is None:
+            block_size = -(-page_count // max_workers)
+            pool = _get_pdf_pool()
+            futures = [
+                pool.submit(_extract_page_range, content, start, min(start + block_size, page_count))
+                for start in range(0, page_count, block_size)
+            ]
+            text = "".join(future.result() for future in futures)
+        
+        if not text.strip():
+            raise ValueError("No text could be extracted from PDF")
+        
+        _cache_text(cache_key, text.strip())
+        return text.strip()
     
     except Exception as e:
         raise ValueError(f"Failed to extract text from PDF using pdfplumber: {str(e)}")
@@ -45,19 +286,21 @@ def extract_text_from_word(content: bytes) -> str:
     """
     Extract text from Word document content using python-docx.
     """
+    cache_key = f"docx:{generate_resume_hash(content)}"
+    cached_text = _get_cached_text(cache_key)
+    if cached_text is not None:
+        return cached_text
+    
     try:
         import docx
-        import io
         
         doc = docx.Document(io.BytesIO(content))
-        text = ""
-        
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
         
         if not text.strip():
             raise ValueError("No text could be extracted from Word document")
-            
+        
+        _cache_text(cache_key, text.strip())
         return text.strip()
     
     except ImportError:
@@ -66,20 +309,34 @@ def extract_text_from_word(content: bytes) -> str:
         raise ValueError(f"Failed to extract text from Word document: {str(e)}")
 
 
+# Byte-order marks checked before falling back to utf-8 / latin-1 (UTF-32 before UTF-16)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
 def decode_text_file(content: bytes) -> str:
     """
-    Decode text file content trying multiple encodings.
-    """
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+    Decode text file content.
     
-    for encoding in encodings:
-        try:
-            return content.decode(encoding)
-        except UnicodeDecodeError:
-            continue
+    Honours a leading byte-order mark, otherwise tries utf-8 once and falls
+    back to latin-1 (which maps every byte, so it cannot fail).
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if content.startswith(bom):
+            try:
+                return content.decode(encoding)
+            except UnicodeDecodeError:
+                break
     
-    # If all encodings fail, use utf-8 with error handling
-    return content.decode('utf-8', errors='replace')
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('latin-1')
 
 
 def generate_draft_profile_from_text(resume_text: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
@@ -109,28 +366,39 @@ def generate_draft_profile_from_text(resume_text: str) -> Tuple[bool, Optional[D
         (success, user_profile_dict, extraction_explanation)
     """
     
+    if len(resume_text.strip()) < _MIN_RESUME_TEXT_LENGTH:
+        return False, None, "Resume text is empty or too short to extract a profile"
+    
     resume_hash = generate_resume_hash(resume_text)
     
+    # Same resume seen recently: decode a fresh copy, callers modify the profile
+    cached = _PROFILE_CACHE.get(resume_hash)
+    if cached is not None:
+        _PROFILE_CACHE.move_to_end(resume_hash)
+        profile_json, extraction_explanation = cached
+        return True, json.loads(profile_json), extraction_explanation
+    
     try:
         # DETERMINISTIC EXTRACTION - NO INVENTION, NO INFERENCE
+        ctx = ResumeCtx.from_text(resume_text)
         
         # 1. Extract skills (explicit only, normalized to lowercase)
-        skill_vocab = extract_explicit_skills_deterministic(resume_text)
+        skill_vocab = extract_explicit_skills_deterministic(ctx)
         
         # 2. Extract education (explicit only)
-        education = extract_explicit_education_for_user_profile(resume_text)
+        education = extract_explicit_education_for_user_profile(ctx)
         
         # 3. Extract projects (mandatory - never drop)
         projects = extract_projects_for_user_profile(resume_text, skill_vocab)
         
         # 4. Extract internships (explicit only)
-        internships = extract_internships_for_user_profile(resume_text, skill_vocab)
+        internships = extract_internships_for_user_profile(ctx, skill_vocab)
         
         # 5. Generate proof pack (all URLs must appear here)
         proof_pack = generate_proof_pack_for_user_profile(projects, internships)
         
         # 6. Extract basic info (name and email from resume if available)
-        basic_info = extract_basic_info_from_resume(resume_text)
+        basic_info = extract_basic_info_from_resume(ctx)
         
         # 7. MANDATORY: Safe default constraints (NOT inferred facts)
         constraints = {
@@ -161,29 +429,32 @@ def generate_draft_profile_from_text(resume_text: str) -> Tuple[bool, Optional[D
             "constraints": constraints
         }
         
+        _PROFILE_CACHE[resume_hash] = (json.dumps(user_profile), extraction_explanation)
+        if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+        
         return True, user_profile, extraction_explanation
         
     except Exception as e:
         return False, None, f"Deterministic extraction failed: {str(e)}"
 
 
-def extract_explicit_skills_deterministic(text: str) -> List[str]:
+def extract_explicit_skills_deterministic(ctx: ResumeCtx) -> List[str]:
     """
     Extract ONLY explicit skills mentioned in resume text.
     Normalize to lowercase, deduplicate.
     NO INFERENCE. NO INVENTION.
     """
     skills = []
-    text_lower = text.lower()
     
     # Look for explicit skills sections first
-    lines = text.split('\n')
+    lines = ctx.lines
     
     for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
+        line_lower = ctx.lines_lower[i].strip()
         
         # Check for skills section headers
-        if any(header in line_lower for header in ['technical skills', 'skills:', 'technologies:', 'programming languages:']):
+        if _SKILLS_HEADER_RE.search(line_lower):
             # Extract skills from this line and potentially next lines
             skills_text = line.split(':')[1] if ':' in line else ''
             
@@ -192,7 +463,7 @@ def extract_explicit_skills_deterministic(text: str) -> List[str]:
                 next_line = lines[j].strip()
                 if not next_line:
                     continue
-                if any(section in next_line.lower() for section in ['achievements', 'social engagements', 'experience', 'education', 'projects', 'work']):
+                if _STOP_SECTION_RE.search(ctx.lines_lower[j]):
                     break
                 skills_text += ' ' + next_line
             
@@ -203,25 +474,22 @@ def extract_explicit_skills_deterministic(text: str) -> List[str]:
     
     # If no explicit skills section found, look for skills mentioned in context
     if not skills:
-        skills = find_skills_in_context(text)
+        skills = find_skills_in_context(ctx.text, text_lower=ctx.text_lower)
     
-    # Normalize to lowercase and deduplicate
-    normalized_skills = []
-    for skill in skills:
-        normalized = skill.lower().strip()
-        if normalized and normalized not in normalized_skills:
-            normalized_skills.append(normalized)
+    # Normalize to lowercase and deduplicate (dict keeps first-seen order)
+    normalized_skills = list(dict.fromkeys(
+        normalized for normalized in (skill.lower().strip() for skill in skills) if normalized
+    ))
     
     return normalized_skills[:20]  # Reasonable limit
 
 
-def extract_basic_info_from_resume(text: str) -> Dict[str, Any]:
+def extract_basic_info_from_resume(ctx: ResumeCtx) -> Dict[str, Any]:
     """
     Extract basic personal information from resume text.
     Returns name, email, phone, location if available.
     """
-    import re
-    
+    text = ctx.text
     basic_info = {
         "name": "",
         "email": "",
@@ -229,33 +497,31 @@ def extract_basic_info_from_resume(text: str) -> Dict[str, Any]:
         "location": ""
     }
     
+    # Only the first match of each pattern is used, so stop scanning there
     # Extract email (most reliable identifier)
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_matches = re.findall(email_pattern, text)
-    if email_matches:
-        basic_info["email"] = email_matches[0]
+    email_match = _EMAIL_RE.search(text)
+    if email_match:
+        basic_info["email"] = email_match.group(0)
     
     # Extract phone number
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phone_matches = re.findall(phone_pattern, text)
-    if phone_matches:
-        # Clean up phone number
-        phone = ''.join(phone_matches[0]) if isinstance(phone_matches[0], tuple) else phone_matches[0]
-        basic_info["phone"] = re.sub(r'[^\d+]', '', phone)
+    phone_match = _PHONE_RE.search(text)
+    if phone_match:
+        # Clean up phone number (findall semantics: the pattern's captured group)
+        phone = phone_match.group(1) or ''
+        basic_info["phone"] = _PHONE_STRIP_RE.sub('', phone)
     
     # Extract name (first line that looks like a name, before email)
-    lines = text.split('\n')
-    for line in lines[:5]:  # Check first 5 lines
+    for line, line_lower in zip(ctx.lines[:5], ctx.lines_lower[:5]):  # Check first 5 lines
         line = line.strip()
         if not line:
             continue
         
         # Skip lines that look like headers or contact info
-        if any(keyword in line.lower() for keyword in ['resume', 'cv', 'curriculum', 'contact', 'email', 'phone']):
+        if any(keyword in line_lower for keyword in ['resume', 'cv', 'curriculum', 'contact', 'email', 'phone']):
             continue
         
         # Skip lines with email or phone
-        if '@' in line or re.search(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}', line):
+        if '@' in line or _PHONE_IN_LINE_RE.search(line):
             continue
         
         # Check if line looks like a name (2-4 words, mostly letters)
@@ -265,17 +531,16 @@ def extract_basic_info_from_resume(text: str) -> Dict[str, Any]:
             break
     
     # Extract location (look for city, state patterns)
-    location_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+)\b'
-    location_matches = re.findall(location_pattern, text)
-    if location_matches:
-        city, state = location_matches[0]
+    location_match = _LOC_RE.search(text)
+    if location_match:
+        city, state = location_match.groups()
         basic_info["location"] = f"{city}, {state}"
     
     # If no name found, generate from email
     if not basic_info["name"] and basic_info["email"]:
         email_name = basic_info["email"].split('@')[0]
         # Convert email username to name format
-        name_parts = re.split(r'[._-]', email_name)
+        name_parts = _EMAIL_NAME_SPLIT_RE.split(email_name)
         basic_info["name"] = ' '.join(word.capitalize() for word in name_parts if word.isalpha())
     
     # Fallback name if still empty
@@ -289,33 +554,22 @@ def extract_basic_info_from_resume(text: str) -> Dict[str, Any]:
     return basic_info
 
 
-def extract_explicit_education_for_user_profile(text: str) -> List[Dict[str, Any]]:
+def extract_explicit_education_for_user_profile(ctx: ResumeCtx) -> List[Dict[str, Any]]:
     """
     Extract education for UserProfile format (different from StudentArtifactPack).
     Handles both line-separated and concatenated text formats.
     """
+    text = ctx.text
     education = []
     
     # Handle concatenated text - look for education indicators
     if 'Education' not in text and 'Institute' not in text and 'University' not in text:
         return education
     
-    # Find education section or institution mentions
-    education_text = text
-    
-    # Look for institution keywords
-    institution_keywords = ['university', 'college', 'institute', 'school']
-    degree_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'b.s.', 'b.a.', 'm.s.', 'm.a.']
-    
-    # Find institution mentions
-    import re
-    
     # Look for patterns like "Indian Institute of Technology" or "University of X"
-    institution_pattern = r'([A-Z][^.]*?(?:University|Institute|College|School)[^.]*?)(?:\s+Expected|\s+Current|\s+Bachelor|\s+Master|\s+PhD|$)'
-    institution_matches = re.findall(institution_pattern, text, re.IGNORECASE)
-    
-    for match in institution_matches:
-        institution_text = match.strip()
+    for match in _INSTITUTION_RE.finditer(text):
+        raw_institution = match.group(1)
+        institution_text = raw_institution.strip()
         
         # Skip if too short
         if len(institution_text) < 10:
@@ -325,44 +579,20 @@ def extract_explicit_education_for_user_profile(text: str) -> List[Dict[str, Any
         institution = institution_text.strip()
         
         # Look for degree information in surrounding text
-        # Find the context around this institution
-        inst_pos = text.find(institution_text)
-        if inst_pos == -1:
-            continue
+        # Find the context around this institution (the match already knows where it is)
+        inst_pos = match.start(1) + len(raw_institution) - len(raw_institution.lstrip())
         
         # Get surrounding text (before and after)
         context_start = max(0, inst_pos - 100)
         context_end = min(len(text), inst_pos + len(institution_text) + 200)
         context = text[context_start:context_end].lower()
         
-        degree = None
-        field = None
-        
-        # Extract degree
-        if any(deg in context for deg in ['bachelor', 'b.tech', 'b.s.', 'b.a.', 'bs ', 'ba ']):
-            degree = "Bachelor's Degree"
-        elif any(deg in context for deg in ['master', 'm.s.', 'm.a.', 'ms ', 'ma ']):
-            degree = "Master's Degree"
-        elif any(deg in context for deg in ['phd', 'ph.d.', 'doctorate']):
-            degree = "PhD"
+        # Extract degree and field (one scan each, then pick by priority)
+        degree_hits = set(_DEGREE_RE.findall(context))
+        degree = next((value for keyword, value in _DEGREE_MAP.items() if keyword in degree_hits), None)
         
-        # Extract field
-        if 'computer science' in context:
-            field = "Computer Science"
-        elif 'software engineering' in context:
-            field = "Software Engineering"
-        elif 'mining engineering' in context:
-            field = "Mining Engineering"
-        elif 'electrical engineering' in context:
-            field = "Electrical Engineering"
-        elif 'mechanical engineering' in context:
-            field = "Mechanical Engineering"
-        elif 'engineering' in context and not field:
-            field = "Engineering"
-        elif 'business' in context:
-            field = "Business"
-        elif 'mathematics' in context:
-            field = "Mathematics"
+        field_hits = set(_FIELD_RE.findall(context))
+        field = next((value for keyword, value in _FIELD_MAP.items() if keyword in field_hits), None)
         
         education.append({
             "institution": institution,
@@ -412,6 +642,11 @@ def extract_projects_for_user_profile(text: str, skill_vocab: List[str]) -> List
         }
     ]
     
+    # Lowercased vocab -> original spelling (first occurrence wins)
+    vocab_lower = {}
+    for vocab_skill in skill_vocab:
+        vocab_lower.setdefault(vocab_skill.lower(), vocab_skill)
+    
     # Check which projects are mentioned in the text
     for project_def in project_definitions:
         # Check if any search term is found
@@ -425,14 +660,12 @@ def extract_projects_for_user_profile(text: str, skill_vocab: List[str]) -> List
             # Find relevant skills from the skill vocabulary
             project_skills = []
             for skill in project_def["skills"]:
-                # Look for this skill in the skill_vocab (case insensitive)
-                for vocab_skill in skill_vocab:
-                    if skill.lower() in vocab_skill.lower() or vocab_skill.lower() in skill.lower():
+                # Look for this skill (or a known alias) in the skill_vocab (case insensitive)
+                for key in (skill, *_PROJECT_SKILL_ALIASES.get(skill, ())):
+                    vocab_skill = vocab_lower.get(key)
+                    if vocab_skill is not None and vocab_skill not in project_skills:
                         project_skills.append(vocab_skill)
             
-            # Remove duplicates
-            project_skills = list(set(project_skills))
-            
             projects.append({
                 "name": project_def["name"],
                 "description": project_def["description"],
@@ -443,22 +676,33 @@ def extract_projects_for_user_profile(text: str, skill_vocab: List[str]) -> List
     return projects
 
 
-def extract_internships_for_user_profile(text: str, skill_vocab: List[str]) -> List[Dict[str, Any]]:
+def _classify_internship_line(line_lower: str) -> set:
+    """Return which of header/stop/role keywords appear in the line, in one scan."""
+    kinds = set()
+    for match in _INTERNSHIP_LINE_RE.finditer(line_lower):
+        kinds.add(match.lastgroup)
+        if match.group() == 'internships':
+            kinds.add('role')  # "internships" also contains "intern"
+    return kinds
+
+
+def extract_internships_for_user_profile(ctx: ResumeCtx, skill_vocab: List[str]) -> List[Dict[str, Any]]:
     """
     Extract internships for UserProfile format.
     """
     internships = []
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    lines = ctx.content_lines
     
     in_experience_section = False
     current_internship = None
     current_description_parts = []
     
-    for line in lines:
-        line_lower = line.lower()
+    for line, line_lower in lines:
+        line_kinds = _classify_internship_line(line_lower)
+        is_bullet = line[0] in '-•'
         
         # Check for experience section
-        if any(header in line_lower for header in ['experience', 'work experience', 'internships']) and len(line) < 50:
+        if 'header' in line_kinds and len(line) < 50:
             in_experience_section = True
             continue
         
@@ -466,13 +710,11 @@ def extract_internships_for_user_profile(text: str, skill_vocab: List[str]) -> L
             continue
         
         # Stop if we hit another major section
-        if any(section in line_lower for section in ['projects', 'education', 'skills']) and len(line) < 50:
+        if 'stop' in line_kinds and len(line) < 50:
             break
         
         # Check if this looks like an internship/job title
-        if (not line.startswith('-') and not line.startswith('•') and 
-            len(line) > 15 and len(line) < 100 and
-            any(indicator in line_lower for indicator in ['intern', 'engineer', 'developer', 'analyst'])):
+        if not is_bullet and 15 < len(line) < 100 and 'role' in line_kinds:
             
             # Save previous internship
             if current_internship and current_description_parts:
@@ -491,7 +733,7 @@ def extract_internships_for_user_profile(text: str, skill_vocab: List[str]) -> L
             current_internship = line.strip()
         
         # Check for bullet points
-        elif line.startswith('-') or line.startswith('•'):
+        elif is_bullet:
             bullet_text = line.lstrip('-•').strip()
             if len(bullet_text) > 15:  # Only substantial bullets
                 current_description_parts.append(bullet_text)
@@ -531,92 +773,18 @@ def generate_proof_pack_for_user_profile(projects: List[Dict[str, Any]], interns
             })
     
     return proof_pack
-    """
-    Extract ONLY explicitly mentioned education.
-    NO INFERENCE. NO INVENTION.
-    """
-    education = []
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    in_education_section = False
-    
-    for line in lines:
-        line_lower = line.lower()
-        
-        # Check for education section header
-        if 'education' in line_lower and len(line) < 50:
-            in_education_section = True
-            continue
-        
-        if in_education_section:
-            # Stop if we hit another major section
-            if any(section in line_lower for section in ['experience', 'projects', 'skills', 'work history']):
-                break
-            
-            # Look for university/college mentions
-            if any(keyword in line_lower for keyword in ['university', 'college', 'institute', 'school']) and len(line) > 10:
-                # Extract what we can see explicitly
-                institution = line.strip().lstrip('-•').strip()
-                
-                # Try to find degree information in the same line
-                degree = None
-                field_of_study = None
-                
-                if any(deg in line_lower for deg in ['bachelor', 'b.s.', 'b.a.', 'bs ', 'ba ']):
-                    degree = "Bachelor's Degree"
-                elif any(deg in line_lower for deg in ['master', 'm.s.', 'm.a.', 'ms ', 'ma ']):
-                    degree = "Master's Degree"
-                elif any(deg in line_lower for deg in ['phd', 'ph.d.', 'doctorate']):
-                    degree = "PhD"
-                
-                # Extract field if explicitly mentioned
-                if 'computer science' in line_lower:
-                    field_of_study = "Computer Science"
-                elif 'software engineering' in line_lower:
-                    field_of_study = "Software Engineering"
-                elif 'electrical engineering' in line_lower:
-                    field_of_study = "Electrical Engineering"
-                elif 'mechanical engineering' in line_lower:
-                    field_of_study = "Mechanical Engineering"
-                elif 'business' in line_lower:
-                    field_of_study = "Business"
-                elif 'mathematics' in line_lower:
-                    field_of_study = "Mathematics"
-                
-                education.append({
-                    "institution": institution,
-                    "degree": degree,
-                    "field_of_study": field_of_study,
-                    "graduation_year": None,  # Only if explicitly mentioned
-                    "gpa": None  # Only if explicitly mentioned
-                })
-                
-                if len(education) >= 3:  # Limit to 3 entries
-                    break
-    
-    return education
 
 
 def extract_links_from_text(text: str) -> List[str]:
     """Extract GitHub, portfolio, and demo URLs from text."""
-    import re
-    
-    # Common URL patterns
-    url_patterns = [
-        r'https?://github\.com/[^\s]+',
-        r'https?://[^\s]*\.github\.io[^\s]*',
-        r'https?://[^\s]*portfolio[^\s]*',
-        r'https?://[^\s]*demo[^\s]*'
-    ]
-    
     links = []
-    for pattern in url_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        links.extend(matches)
+    for url_re in _URL_RES:
+        links.extend(url_re.findall(text))
     
-    return list(set(links))  # Remove duplicates
+    return list(dict.fromkeys(links))  # Remove duplicates, keep first-seen order
 
 
+@lru_cache(maxsize=1024)
 def extract_company_from_title(title: str) -> str:
     """Extract company name from job/internship title."""
     # Simple heuristic - look for "at Company" or "- Company"
@@ -707,8 +875,7 @@ def parse_skills_from_skills_section(skills_text: str) -> List[str]:
         return []
     
     # Clean and split the skills text
-    skills_text = skills_text.replace(',', ' ').replace(';', ' ').replace('|', ' ').replace('•', ' ')
-    skills_text = skills_text.replace(':', ' ').replace('&', ' ')
+    skills_text = skills_text.translate(_SKILL_SEP_TABLE)
     
     # Split by common separators and clean
     words = []
@@ -728,17 +895,14 @@ def parse_skills_from_skills_section(skills_text: str) -> List[str]:
         # Check for multi-word skills
         if i < len(words) - 1:
             two_word = f"{word} {words[i+1]}".lower()
-            if two_word in ["machine learning", "data science", "web development", "software engineering", 
-                           "computer science", "artificial intelligence", "data analysis", "project management",
-                           "data structures", "rest apis", "version control"]:
+            if two_word in _MULTI_WORD_SKILLS:
                 skills.append(format_skill_properly(two_word))
                 i += 2
                 continue
         
         # Single word skills (filter out common non-skills and section headers)
         if (len(word) > 2 and 
-            word.lower() not in ['and', 'the', 'with', 'for', 'experience', 'years', 'including', 
-                                'languages', 'core', 'cs', 'web', 'tools', 'libraries', 'basic', 'concepts'] and
+            word.lower() not in _NON_SKILL_WORDS and
             not word.isdigit() and
             not word.endswith(':')):
             formatted_skill = format_skill_properly(word)
@@ -750,24 +914,17 @@ def parse_skills_from_skills_section(skills_text: str) -> List[str]:
     return skills
 
 
-def find_skills_in_context(text: str) -> List[str]:
+def find_skills_in_context(text: str, text_lower: Optional[str] = None) -> List[str]:
     """Find skills mentioned in context throughout the resume."""
-    # Common technical skills that might be mentioned
-    known_skills = [
-        "python", "javascript", "java", "c++", "c#", "go", "rust", "php", "ruby", "swift",
-        "react", "angular", "vue", "node.js", "express", "django", "flask", "fastapi",
-        "sql", "mysql", "postgresql", "mongodb", "redis", "sqlite",
-        "aws", "azure", "gcp", "docker", "kubernetes", "git", "github",
-        "html", "css", "typescript", "graphql", "rest", "api",
-        "tensorflow", "pytorch", "pandas", "numpy", "scikit-learn",
-        "linux", "bash", "jenkins", "ci/cd"
-    ]
+    if text_lower is None:
+        text_lower = text.lower()
+    found = set(_SKILL_TOKEN_RE.findall(text_lower))
+    found.intersection_update(_CONTEXT_SKILL_TOKENS)
+    found.update(_CONTEXT_SKILL_RESIDUAL_RE.findall(text_lower))
     
-    text_lower = text.lower()
     found_skills = []
-    
-    for skill in known_skills:
-        if skill in text_lower:
+    for skill in _CONTEXT_SKILLS:
+        if skill in found:
             formatted_skill = format_skill_properly(skill)
             if formatted_skill not in found_skills:
                 found_skills.append(formatted_skill)
@@ -775,48 +932,109 @@ def find_skills_in_context(text: str) -> List[str]:
     return found_skills
 
 
+# Skill spellings that str.title() would get wrong
+_FORMAT_MAP = {
+    "javascript": "JavaScript",
+    "typescript": "TypeScript",
+    "c++": "C++",
+    "c#": "C#",
+    "node.js": "Node.js",
+    "postgresql": "PostgreSQL",
+    "mongodb": "MongoDB",
+    "mysql": "MySQL",
+    "fastapi": "FastAPI",
+    "tensorflow": "TensorFlow",
+    "pytorch": "PyTorch",
+    "scikit-learn": "Scikit-learn",
+    "ci/cd": "CI/CD",
+    "html": "HTML",
+    "css": "CSS",
+    "sql": "SQL",
+    "api": "API",
+    "aws": "AWS",
+    "gcp": "GCP",
+    "graphql": "GraphQL",
+    "rest": "REST"
+}
+
+
+@lru_cache(maxsize=4096)
 def format_skill_properly(skill: str) -> str:
     """Format skill name with proper capitalization."""
     skill = skill.strip().lower()
     
-    # Special formatting cases
-    formatting_map = {
-        "javascript": "JavaScript",
-        "typescript": "TypeScript",
-        "c++": "C++",
-        "c#": "C#",
-        "node.js": "Node.js",
-        "postgresql": "PostgreSQL",
-        "mongodb": "MongoDB",
-        "mysql": "MySQL",
-        "fastapi": "FastAPI",
-        "tensorflow": "TensorFlow",
-        "pytorch": "PyTorch",
-        "scikit-learn": "Scikit-learn",
-        "ci/cd": "CI/CD",
-        "html": "HTML",
-        "css": "CSS",
-        "sql": "SQL",
-        "api": "API",
-        "aws": "AWS",
-        "gcp": "GCP",
-        "graphql": "GraphQL",
-        "rest": "REST"
-    }
-    
-    return formatting_map.get(skill, skill.title())
+    return _FORMAT_MAP.get(skill, skill.title())
+
+
+_MAX_SKILLS_PER_PROJECT = 5
+
+
+@lru_cache(maxsize=256)
+def _lowercased_skills(all_skills: Tuple[str, ...]) -> Tuple[Tuple[str, str, str], ...]:
+    """(skill, lowercased skill, first character) triples, computed once per skill vocabulary."""
+    return tuple((skill, skill.lower(), skill.lower()[:1]) for skill in all_skills)
 
 
 def find_relevant_skills_for_project_text(description: str, all_skills: List[str]) -> List[str]:
     """Find skills relevant to a project based on its description."""
     project_skills = []
     description_lower = description.lower()
+    # A skill can only occur if its first character does, so skip the rest without a substring scan
+    description_chars = set(description_lower)
     
-    for skill in all_skills:
-        if skill.lower() in description_lower:
+    for skill, skill_lower, first_char in _lowercased_skills(tuple(all_skills)):
+        if (not first_char or first_char in description_chars) and skill_lower in description_lower:
             project_skills.append(skill)
+            if len(project_skills) == _MAX_SKILLS_PER_PROJECT:
+                break  # Limit to 5 skills per project
     
-    return project_skills[:5]  # Limit to 5 skills per project
+    return project_skills
+
+
+# (profile field, heading, text when entries were found, text when none were)
+_EXPLANATION_SECTIONS = (
+    (
+        "skill_vocab", "Skills",
+        "- Found explicit skills section or skills mentioned in context\n"
+        "- Only included skills explicitly mentioned in your resume\n"
+        "- Did not infer or add any skills not present in the text\n\n",
+        "- No explicit skills section found\n"
+        "- You can add your skills manually in the next step\n\n"
+    ),
+    (
+        "education", "Education",
+        "- Found education section with institution names\n"
+        "- Extracted degree and field information where explicitly stated\n"
+        "- Left fields empty where information was unclear\n\n",
+        "- No clear education section found\n"
+        "- You can add your education manually in the next step\n\n"
+    ),
+    (
+        "projects", "Projects/Experience",
+        "- Found experience or projects section\n"
+        "- Extracted bullet points as achievements\n"
+        "- Matched skills to relevant bullet points\n"
+        "- All content is DRAFT and requires your review and approval\n\n",
+        "- No clear projects or experience section found\n"
+        "- You can add your projects manually in the next step\n\n"
+    ),
+    (
+        "internships", "Internships",
+        "- Found internship or work experience section\n"
+        "- Extracted role and company information\n"
+        "- All content is DRAFT and requires your review and approval\n\n",
+        "- No internships found in experience section\n"
+        "- You can add your internships manually in the next step\n\n"
+    ),
+    (
+        "certificates", "Certificates",
+        "- Found certificates or credentials section\n"
+        "- Extracted certification details where available\n"
+        "- All content is DRAFT and requires your review and approval\n\n",
+        "- No certificates section found\n"
+        "- You can add your certificates manually in the next step\n\n"
+    ),
+)
 
 
 def explain_extraction_results(resume_text: str, draft_profile: Dict[str, Any]) -> str:
@@ -824,107 +1042,81 @@ def explain_extraction_results(resume_text: str, draft_profile: Dict[str, Any])
     READ-ONLY explanation of what was extracted and why.
     This agent explains decisions, never makes them.
     """
-    explanation = "## What We Extracted From Your Resume\n\n"
-    
-    # Skills explanation
-    skills_count = len(draft_profile.get('skill_vocab', []))
-    explanation += f"**Skills ({skills_count} found):**\n"
-    if skills_count > 0:
-        explanation += "- Found explicit skills section or skills mentioned in context\n"
-        explanation += "- Only included skills explicitly mentioned in your resume\n"
-        explanation += "- Did not infer or add any skills not present in the text\n\n"
-    else:
-        explanation += "- No explicit skills section found\n"
-        explanation += "- You can add your skills manually in the next step\n\n"
+    parts = ["## What We Extracted From Your Resume\n\n"]
     
-    # Education explanation
-    education_count = len(draft_profile.get('education', []))
-    explanation += f"**Education ({education_count} found):**\n"
-    if education_count > 0:
-        explanation += "- Found education section with institution names\n"
-        explanation += "- Extracted degree and field information where explicitly stated\n"
-        explanation += "- Left fields empty where information was unclear\n\n"
-    else:
-        explanation += "- No clear education section found\n"
-        explanation += "- You can add your education manually in the next step\n\n"
+    get_field = draft_profile.get
+    for field, heading, found_text, missing_text in _EXPLANATION_SECTIONS:
+        count = len(get_field(field) or ())
+        parts.append(f"**{heading} ({count} found):**\n")
+        parts.append(found_text if count > 0 else missing_text)
     
-    # Projects explanation
-    projects_count = len(draft_profile.get('projects', []))
-    explanation += f"**Projects/Experience ({projects_count} found):**\n"
-    if projects_count > 0:
-        explanation += "- Found experience or projects section\n"
-        explanation += "- Extracted bullet points as achievements\n"
-        explanation += "- Matched skills to relevant bullet points\n"
-        explanation += "- All content is DRAFT and requires your review and approval\n\n"
-    else:
-        explanation += "- No clear projects or experience section found\n"
-        explanation += "- You can add your projects manually in the next step\n\n"
+    parts.append("**Important:** This is a DRAFT. Please review and edit everything before proceeding.")
     
-    # Internships explanation
-    internships_count = len(draft_profile.get('internships', []))
-    explanation += f"**Internships ({internships_count} found):**\n"
-    if internships_count > 0:
-        explanation += "- Found internship or work experience section\n"
-        explanation += "- Extracted role and company information\n"
-        explanation += "- All content is DRAFT and requires your review and approval\n\n"
-    else:
-        explanation += "- No internships found in experience section\n"
-        explanation += "- You can add your internships manually in the next step\n\n"
-    
-    # Certificates explanation
-    certificates_count = len(draft_profile.get('certificates', []))
-    explanation += f"**Certificates ({certificates_count} found):**\n"
-    if certificates_count > 0:
-        explanation += "- Found certificates or credentials section\n"
-        explanation += "- Extracted certification details where available\n"
-        explanation += "- All content is DRAFT and requires your review and approval\n\n"
-    else:
-        explanation += "- No certificates section found\n"
-        explanation += "- You can add your certificates manually in the next step\n\n"
-    
-    # Certificates explanation
-    certificates_count = len(draft_profile.get('certificates', []))
-    explanation += f"**Certificates ({certificates_count} found):**\n"
-    if certificates_count > 0:
-        explanation += "- Found certificates or credentials section\n"
-        explanation += "- Extracted certification details where available\n"
-        explanation += "- All content is DRAFT and requires your review and approval\n\n"
-    else:
-        explanation += "- No certificates section found\n"
-        explanation += "- You can add your certificates manually in the next step\n\n"
-    
-    explanation += "**Important:** This is a DRAFT. Please review and edit everything before proceeding."
-    
-    return explanation
+    return "".join(parts)
+
 
+@lru_cache(maxsize=4096)
+def _normalize_job_skills(required_skills: Tuple[str, ...]) -> frozenset:
+    """Lowercased set of a job's required skills (shared across users ranking the same jobs)."""
+    return frozenset(skill.lower() for skill in required_skills)
 
-def rank_jobs_for_user(user_profile: Dict[str, Any], all_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+@lru_cache(maxsize=1024)
+def _normalize_profile_for_ranking(
+    skill_vocab: Tuple[str, ...], blocked_companies: Tuple[str, ...], locations: Tuple[str, ...]
+) -> Tuple[frozenset, frozenset, Tuple[str, ...]]:
+    """Lowercased user skills, blocked companies and preferred locations.
+    
+    Keyed on the values themselves: profiles are reloaded from the database for
+    every ranking, so the same user hits this cache across scheduler runs.
+    """
+    return (
+        frozenset(skill.lower() for skill in skill_vocab),
+        frozenset(company.lower() for company in blocked_companies),
+        tuple(loc.lower() for loc in locations)
+    )
+
+
+def rank_jobs_for_user(user_profile: Dict[str, Any], all_jobs: List[Dict[str, Any]],
+                       top_k: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     AI job ranking system - analyzes all jobs and ranks them for the user.
     
     Returns jobs with AI match scores, status decisions, and reasoning.
+    If top_k is given, only the top_k best matches are returned.
     """
-    user_skills = set(skill.lower() for skill in user_profile.get('skill_vocab', []))
     user_constraints = user_profile.get('constraints', {})
-    blocked_companies = set(company.lower() for company in user_constraints.get('blocked_companies', []))
-    preferred_locations = [loc.lower() for loc in user_constraints.get('location', [])]
+    user_skills, blocked_companies, preferred_locations = _normalize_profile_for_ranking(
+        tuple(user_profile.get('skill_vocab', [])),
+        tuple(user_constraints.get('blocked_companies', [])),
+        tuple(user_constraints.get('location', []))
+    )
+    # A "remote" preference accepts every location
+    accepts_any_location = not preferred_locations or 'remote' in preferred_locations
+    preferred_location_set = frozenset(preferred_locations)
     min_match_score = user_constraints.get('min_match_score', 0.6)
+    min_match_text = f"{min_match_score:.1%}"
     
     ranked_jobs = []
     
     for job in all_jobs:
         # Calculate skill match score
-        job_skills = set(skill.lower() for skill in job.get('required_skills', []))
+        job_skills = _normalize_job_skills(tuple(job.get('required_skills', [])))
         matched_skills = user_skills.intersection(job_skills)
         skill_match_ratio = len(matched_skills) / len(job_skills) if job_skills else 0
         
         # Location preference score
-        job_location = job.get('location', '').lower()
-        location_match = 1.0 if not preferred_locations else 0.0
-        for pref_loc in preferred_locations:
-            if pref_loc in job_location or job_location in pref_loc or pref_loc == 'remote':
+        location_match = 1.0 if accepts_any_location else 0.0
+        if not accepts_any_location:
+            job_location = job.get('location', '').lower()
+            if job_location in preferred_location_set:
                 location_match = 1.0
-                break
+            else:
+                # Partial matches ("austin" vs "austin, tx") need the substring check
+                for pref_loc in preferred_locations:
+                    if pref_loc in job_location or job_location in pref_loc:
+                        location_match = 1.0
+                        break
         
         # Experience level match (simple heuristic)
         min_exp = job.get('min_experience_years', 0)
@@ -934,14 +1126,13 @@ def rank_jobs_for_user(user_profile: Dict[str, Any], all_jobs: List[Dict[str, An
         match_score = (skill_match_ratio * 0.6) + (location_match * 0.3) + (exp_match * 0.1)
         
         # AI decision logic
-        company_name = job.get('company', '').lower()
-        
-        if company_name in blocked_companies:
+        # Most users block no one, so only lowercase the company when there is a list to check
+        if blocked_companies and job.get('company', '').lower() in blocked_companies:
             status = 'blocked'
             reasoning = f"Company '{job.get('company')}' is in your blocked companies list"
         elif match_score < min_match_score:
             status = 'rejected_by_ai'
-            reasoning = f"Match score {match_score:.1%} is below your minimum threshold of {min_match_score:.1%}"
+            reasoning = f"Match score {match_score:.1%} is below your minimum threshold of {min_match_text}"
         elif len(matched_skills) == 0:
             status = 'rejected_by_ai'
             reasoning = "No matching skills found for this position"
@@ -955,23 +1146,43 @@ def rank_jobs_for_user(user_profile: Dict[str, Any], all_jobs: List[Dict[str, An
             status = 'rejected_by_ai'
             reasoning = f"Match score {match_score:.1%} below threshold"
         
-        # Create enhanced job object
-        enhanced_job = {
-            **job,
-            'match_score': round(match_score, 3),
-            'matched_skills': list(matched_skills),
-            'status': status,
-            'ai_reasoning': reasoning
-        }
+        # Create enhanced job object (a copy: the same job dicts are ranked for every user)
+        enhanced_job = job.copy()
+        enhanced_job['match_score'] = round(match_score, 3)
+        enhanced_job['matched_skills'] = list(matched_skills)
+        enhanced_job['status'] = status
+        enhanced_job['ai_reasoning'] = reasoning
         
         ranked_jobs.append(enhanced_job)
     
-    # Sort by match score (highest first)
-    ranked_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+    # Sort by match score (highest first); a partial top-k selection avoids sorting the tail
+    if top_k is not None:
+        return heapq.nlargest(top_k, ranked_jobs, key=itemgetter('match_score'))
+    ranked_jobs.sort(key=itemgetter('match_score'), reverse=True)
     
     return ranked_jobs
 
 
+def _build_artifact_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one UserProfile project into a StudentArtifactPack project with a single verified bullet."""
+    skills = project.get('skills', [])[:5]  # Limit to 5 skills
+    description = project.get('description')
+    
+    # Project description as the bullet, or a placeholder so there is always one
+    bullet_description = description[:200] if description else f"Worked on {project.get('name', 'project')}"
+    
+    return {
+        "name": project.get('name', 'Project'),
+        "description": project.get('description', 'Project description'),
+        "skills": skills,
+        "bullets": [{
+            "description": bullet_description,  # Limit length
+            "skills": skills[:3],  # Limit to 3 skills
+            "verified": True  # Mark as verified for engine execution
+        }]
+    }
+
+
 def convert_user_profile_to_student_artifact_pack(user_profile: Dict[str, Any]) -> Dict[str, Any]:
     """
     Convert UserProfile format to StudentArtifactPack format for engine execution.
@@ -983,42 +1194,17 @@ def convert_user_profile_to_student_artifact_pack(user_profile: Dict[str, Any])
     skills = user_profile.get('skill_vocab', [])
     
     # Convert education format
-    education_entries = []
-    for edu in user_profile.get('education', []):
-        education_entries.append({
+    education_entries = [
+        {
             "institution": edu.get('institution', 'Unknown Institution'),
             "degree": edu.get('degree'),
             "field_of_study": edu.get('field')
-        })
+        }
+        for edu in user_profile.get('education', [])
+    ]
     
     # Convert projects to proper format with bullets
-    projects_with_bullets = []
-    for project in user_profile.get('projects', []):
-        # Create verified bullets for each project
-        project_bullets = []
-        
-        # Add project description as a bullet
-        if project.get('description'):
-            project_bullets.append({
-                "description": project['description'][:200],  # Limit length
-                "skills": project.get('skills', [])[:3],  # Limit to 3 skills
-                "verified": True  # Mark as verified for engine execution
-            })
-        
-        # Ensure we have at least one bullet
-        if not project_bullets:
-            project_bullets.append({
-                "description": f"Worked on {project.get('name', 'project')}",
-                "skills": project.get('skills', [])[:3],
-                "verified": True
-            })
-        
-        projects_with_bullets.append({
-            "name": project.get('name', 'Project'),
-            "description": project.get('description', 'Project description'),
-            "skills": project.get('skills', [])[:5],  # Limit to 5 skills
-            "bullets": project_bullets
-        })
+    projects_with_bullets = [_build_artifact_project(project) for project in user_profile.get('projects', [])]
     
     # Convert constraints
     constraints_data = user_profile.get('constraints', {})
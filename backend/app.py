@@ -7,20 +7,23 @@ import sys
 import os
 import time
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse
+import orjson
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.engine import run_autopilot
-from backend.database import PersistentDatabase
+from backend.database import get_db
 from backend.auth import AuthManager
-from backend.scheduler import start_autonomous_ai_agent  # Import autonomous agent
+from backend.scheduler import start_autonomous_ai_agent, stop_autonomous_ai_agent  # Import autonomous agent
 from backend.job_fetcher import JobFetcher  # Import job fetcher for portal integration
 from backend.models import (
     UserRegistrationRequest, UserLoginRequest, AuthResponse,
@@ -36,16 +39,36 @@ from backend.models import (
 )
 from backend.ai_agents import (
     generate_resume_hash, generate_draft_profile_from_text, explain_extraction_results,
-    decode_text_file, extract_text_from_pdf_pdfplumber, extract_text_from_word
+    decode_text_file, extract_text_from_pdf_pdfplumber, extract_text_from_word, shutdown_pdf_pool
 )
 from schemas.user_profile_schema import UserProfile
 from schemas.job_schema import JobListing
 from schemas.student_schema import StudentArtifactPack
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for large routes that have no response_model.
+
+    Routes with a response_model keep the default class (FastAPI serializes those via Pydantic).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release process-wide resources on shutdown (startup work happens at import below)."""
+    yield
+    stop_autonomous_ai_agent()
+    shutdown_pdf_pool()
+    db.close()
+
+
 app = FastAPI(
     title="Persistent Job Application Platform",
     description="Student-facing web platform for autonomous job applications with persistent profiles",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -58,7 +81,7 @@ app.add_middleware(
 )
 
 # Database and auth instances
-db = PersistentDatabase()
+db = get_db()
 auth_manager = AuthManager(db)
 job_fetcher = JobFetcher()  # Initialize job fetcher for portal integration
 
@@ -87,8 +110,11 @@ async def root():
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
+# The auth endpoints are plain `def` so FastAPI runs them in its threadpool: the
+# Argon2 hashing/verification inside takes ~ARGON2_TARGET_SECONDS and must not
+# block the event loop.
 @app.post("/api/auth/register", response_model=AuthResponse)
-async def register_user(request: UserRegistrationRequest):
+def register_user(request: UserRegistrationRequest):
     """Register a new user account."""
     success, message, user_id = auth_manager.register_user(request.email, request.password)
     
@@ -101,7 +127,7 @@ async def register_user(request: UserRegistrationRequest):
 
 
 @app.post("/api/auth/login", response_model=AuthResponse)
-async def login_user(request: UserLoginRequest):
+def login_user(request: UserLoginRequest):
     """Login user and return session token."""
     success, message, token, user_id = auth_manager.login_user(request.email, request.password)
     
@@ -145,11 +171,12 @@ async def upload_resume(
         content = await file.read()
         filename = file.filename.lower() if file.filename else ""
         
-        # Extract text using appropriate method (STRICT: pdfplumber ONLY for PDFs)
+        # Extract text using appropriate method (STRICT: pdfplumber ONLY for PDFs).
+        # PDF/Word parsing is CPU-bound and waits on worker processes, so it runs off the event loop
         if filename.endswith('.pdf'):
-            resume_text = extract_text_from_pdf_pdfplumber(content)
+            resume_text = await run_in_threadpool(extract_text_from_pdf_pdfplumber, content)
         elif filename.endswith(('.doc', '.docx')):
-            resume_text = extract_text_from_word(content)
+            resume_text = await run_in_threadpool(extract_text_from_word, content)
         else:
             resume_text = decode_text_file(content)
         
@@ -379,7 +406,7 @@ async def save_profile(
         raise HTTPException(status_code=400, detail=f"Failed to save profile: {str(e)}")
 
 
-@app.get("/api/profile/get")
+@app.get("/api/profile/get", response_class=ORJSONResponse)
 async def get_user_profile(authorization: Optional[str] = Header(None)):
     """Get user's profile (SINGLE SOURCE OF TRUTH)."""
     token = get_auth_token(authorization)
@@ -470,7 +497,7 @@ async def get_job_listings(limit: int = 50):
         raise HTTPException(status_code=500, detail=f"Failed to get job listings: {str(e)}")
 
 
-@app.get("/api/jobs/ai-ranked")
+@app.get("/api/jobs/ai-ranked", response_class=ORJSONResponse)
 async def get_ai_ranked_jobs(
     authorization: Optional[str] = Header(None)
 ):
@@ -814,7 +841,7 @@ async def get_current_artifacts(authorization: Optional[str] = Header(None)):
         raise HTTPException(status_code=500, detail=f"Failed to get current artifacts: {str(e)}")
 
 
-@app.get("/api/artifacts/status")
+@app.get("/api/artifacts/status", response_class=ORJSONResponse)
 async def get_artifact_workflow_status(authorization: Optional[str] = Header(None)):
     """
     Get complete artifact workflow status for user.
@@ -846,7 +873,8 @@ async def get_artifact_workflow_status(authorization: Optional[str] = Header(Non
         current_draft = None
         draft_data = approval_service.db.get_draft_artifact(user_id)
         if draft_data:
-            current_draft = DraftArtifactPack(
+            # Drafts are only saved after passing DraftArtifactPack validation; skip re-running it
+            current_draft = DraftArtifactPack.model_construct(
                 student_artifact_pack=draft_data["student_artifact_pack"],
                 status=draft_data["status"],
                 created_at=datetime.fromisoformat(draft_data["created_at"]),
@@ -14,12 +14,19 @@ SAFETY RULES:
 import hashlib
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 
 from backend.models import DraftArtifactPack, ArtifactSnapshot, UserConfirmation
 from schemas.user_profile_schema import UserProfile
 
 
+@lru_cache(maxsize=4096)
+def _bullet_id(project_index: int, bullet_index: int) -> str:
+    """ID the approval UI uses for a bullet (built once per position, then reused)."""
+    return f"project_{project_index}_bullet_{bullet_index}"
+
+
 class ArtifactGenerator:
     """
     Converts UserProfile to draft StudentArtifactPack with explicit non-approval marking.
@@ -34,17 +41,17 @@ class ArtifactGenerator:
     def __init__(self, database=None):
         """Initialize with database connection."""
         if database is None:
-            from backend.database import PersistentDatabase
-            self.db = PersistentDatabase()
+            from backend.database import get_db
+            self.db = get_db()
         else:
             self.db = database
     
-    def generate_draft(self, user_profile: Dict[str, Any], user_id: int = None) -> DraftArtifactPack:
+    def generate_draft(self, user_profile: Union[Dict[str, Any], UserProfile], user_id: int = None) -> DraftArtifactPack:
         """
         Generate draft StudentArtifactPack from UserProfile.
         
         Args:
-            user_profile: UserProfile data (validated)
+            user_profile: UserProfile data, or an already validated UserProfile model
             user_id: User ID for database storage (optional)
             
         Returns:
@@ -53,17 +60,26 @@ class ArtifactGenerator:
         Raises:
             ValueError: If user_profile is invalid or missing required fields
         """
+        if isinstance(user_profile, UserProfile):
+            return self.generate_draft_from_model(user_profile, user_id)
+        
         # Validate input is a proper UserProfile
         try:
-            profile = UserProfile(**user_profile)
+            profile = UserProfile.model_validate(user_profile)
         except Exception as e:
             raise ValueError(f"Invalid UserProfile: {e}")
         
+        return self.generate_draft_from_model(profile, user_id)
+    
+    def generate_draft_from_model(self, profile: UserProfile, user_id: int = None) -> DraftArtifactPack:
+        """
+        Generate draft StudentArtifactPack from an already validated UserProfile (no re-validation).
+        """
         # Generate source profile hash for traceability
-        source_profile_hash = self._generate_profile_hash(user_profile)
+        source_profile_hash = self._generate_profile_hash(profile)
         
         # Convert to StudentArtifactPack format with DRAFT bullets
-        draft_student_artifact_pack = self._convert_to_student_artifact_pack(profile)
+        draft_student_artifact_pack = self._convert_to_student_artifact_pack(profile, source_profile_hash)
         
         draft = DraftArtifactPack(
             student_artifact_pack=draft_student_artifact_pack,
@@ -73,29 +89,32 @@ class ArtifactGenerator:
         
         # Save to database if user_id provided
         if user_id is not None:
-            draft_id = str(uuid.uuid4())
-            success = self.db.save_draft_artifact(
-                draft_id=draft_id,
+            # Returns the existing draft's id when an identical draft is already current
+            saved_draft_id = self.db.save_draft_artifact(
+                draft_id=str(uuid.uuid4()),
                 user_id=user_id,
                 student_artifact_pack=draft_student_artifact_pack,
                 source_profile_hash=source_profile_hash
             )
-            if not success:
+            if not saved_draft_id:
                 raise RuntimeError("Failed to save draft artifact to database")
         
         return draft
     
-    def _generate_profile_hash(self, user_profile: Dict[str, Any]) -> str:
+    def _generate_profile_hash(self, profile: UserProfile) -> str:
         """Generate hash of UserProfile for traceability."""
         # Create deterministic string representation
-        profile_str = f"{user_profile.get('student_id', '')}:{len(user_profile.get('skill_vocab', []))}:{len(user_profile.get('projects', []))}"
-        return hashlib.sha256(profile_str.encode('utf-8')).hexdigest()
+        profile_str = f"{profile.student_id}:{len(profile.skill_vocab)}:{len(profile.projects)}"
+        # Traceability tag only (not a security boundary), so a short BLAKE2b digest is enough
+        return hashlib.blake2b(profile_str.encode('utf-8'), digest_size=16).hexdigest()
     
-    def _convert_to_student_artifact_pack(self, profile: UserProfile) -> Dict[str, Any]:
+    def _convert_to_student_artifact_pack(self, profile: UserProfile, source_profile_hash: str) -> Dict[str, Any]:
         """
         Convert UserProfile to StudentArtifactPack format.
         
         CRITICAL SAFETY RULE: All bullets marked verified: false
+        
+        source_profile_hash is the hash generate_draft already computed for this profile.
         """
         # Convert projects with DRAFT bullets (verified: false)
         converted_projects = []
@@ -132,7 +151,7 @@ class ArtifactGenerator:
         }
         
         return {
-            "source_resume_hash": f"profile_{self._generate_profile_hash(profile.dict())}",
+            "source_resume_hash": f"profile_{source_profile_hash}",
             "skill_vocab": profile.skill_vocab,
             "education": converted_education,
             "projects": converted_projects,
@@ -154,8 +173,8 @@ class ApprovalService:
     def __init__(self, database=None):
         """Initialize with database connection."""
         if database is None:
-            from backend.database import PersistentDatabase
-            self.db = PersistentDatabase()
+            from backend.database import get_db
+            self.db = get_db()
         else:
             self.db = database
     
@@ -193,7 +212,7 @@ class ApprovalService:
         
         # Create approval metadata
         approval_metadata = {
-            "user_confirmation": user_confirmation.dict(),
+            "user_confirmation": user_confirmation.model_dump(),
             "verification_count": len(user_confirmation.bullets_verified),
             "modified_bullets": [
                 bv["bullet_id"] for bv in user_confirmation.bullets_verified 
@@ -247,8 +266,10 @@ class ApprovalService:
         if not snapshot_data:
             return None
         
-        # Convert database data back to ArtifactSnapshot model
-        return ArtifactSnapshot(
+        # Convert database data back to ArtifactSnapshot model. The row was validated as an
+        # ArtifactSnapshot (in ApprovalService.submit_for_approval) before it was inserted and
+        # snapshots are never updated, so the validators are skipped here
+        return ArtifactSnapshot.model_construct(
             id=snapshot_data["id"],
             user_id=snapshot_data["user_id"],
             student_artifact_pack=snapshot_data["student_artifact_pack"],
@@ -271,41 +292,44 @@ class ApprovalService:
         draft_bullets = self._extract_bullets_from_draft(draft.student_artifact_pack)
         verified_bullet_ids = {bv["bullet_id"] for bv in confirmation.bullets_verified}
         
-        for bullet_id in draft_bullets:
-            if bullet_id not in verified_bullet_ids:
-                raise ValueError(f"Bullet {bullet_id} not verified by user")
+        missing_bullets = draft_bullets - verified_bullet_ids
+        if missing_bullets:
+            raise ValueError(f"Bullets not verified by user: {', '.join(sorted(missing_bullets))}")
     
-    def _extract_bullets_from_draft(self, artifact_pack: Dict[str, Any]) -> List[str]:
+    def _extract_bullets_from_draft(self, artifact_pack: Dict[str, Any]) -> Set[str]:
         """Extract bullet IDs from draft artifact pack."""
-        bullet_ids = []
-        for i, project in enumerate(artifact_pack.get("projects", [])):
-            for j, bullet in enumerate(project.get("bullets", [])):
-                bullet_ids.append(f"project_{i}_bullet_{j}")
-        return bullet_ids
+        return {
+            _bullet_id(i, j)
+            for i, project in enumerate(artifact_pack.get("projects", ()))
+            for j in range(len(project.get("bullets", ())))
+        }
     
     def _apply_user_verifications(
         self, 
         draft_artifact_pack: Dict[str, Any], 
         confirmation: UserConfirmation
     ) -> Dict[str, Any]:
-        """Apply user verifications to create approved artifact pack."""
-        approved_pack = draft_artifact_pack.copy()
-        
+        """Apply user verifications to create approved artifact pack (the draft is left untouched)."""
         # Create verification lookup
         verification_lookup = {
             bv["bullet_id"]: bv["verified"] 
             for bv in confirmation.bullets_verified
         }
         
-        # Apply verifications to bullets
-        for i, project in enumerate(approved_pack.get("projects", [])):
-            for j, bullet in enumerate(project.get("bullets", [])):
-                bullet_id = f"project_{i}_bullet_{j}"
-                if bullet_id in verification_lookup:
-                    bullet["verified"] = verification_lookup[bullet_id]
-                else:
-                    # If not explicitly verified, keep as false
-                    bullet["verified"] = False
+        # Copy only the projects/bullets subtree we change; bullets not explicitly verified stay false
+        approved_pack = {
+            **draft_artifact_pack,
+            "projects": [
+                {
+                    **project,
+                    "bullets": [
+                        {**bullet, "verified": verification_lookup.get(_bullet_id(i, j), False)}
+                        for j, bullet in enumerate(project.get("bullets", []))
+                    ]
+                }
+                for i, project in enumerate(draft_artifact_pack.get("projects", []))
+            ]
+        }
         
         return approved_pack
 
@@ -323,8 +347,8 @@ class EngineGateway:
     def __init__(self, approval_service: ApprovalService, database=None):
         self.approval_service = approval_service
         if database is None:
-            from backend.database import PersistentDatabase
-            self.db = PersistentDatabase()
+            from backend.database import get_db
+            self.db = get_db()
         else:
             self.db = database
     
@@ -362,11 +386,7 @@ class EngineGateway:
         self._validate_all_bullets_verified(approved_artifact_pack)
         
         # Get job data for engine execution
-        jobs_data = []
-        for job_id in job_ids:
-            job = self.db.get_job_by_id(job_id)
-            if job:
-                jobs_data.append(job)
+        jobs_data = self.db.get_jobs_by_ids(job_ids)
         
         if not jobs_data:
             raise ValueError("No valid jobs found for execution")
@@ -427,9 +447,16 @@ class EngineGateway:
     
     def _validate_all_bullets_verified(self, artifact_pack: Dict[str, Any]) -> None:
         """Validate that all bullets in the artifact pack are verified."""
-        for project in artifact_pack.get("projects", []):
-            for bullet in project.get("bullets", []):
-                if not bullet.get("verified", False):
-                    raise ValueError(
-                        f"Unverified bullet found in approved snapshot: {bullet.get('description', 'Unknown')}"
-                    )
\ No newline at end of file
+        unverified = next(
+            (
+                bullet
+                for project in artifact_pack.get("projects", ())
+                for bullet in project.get("bullets", ())
+                if not bullet.get("verified", False)
+            ),
+            None
+        )
+        if unverified is not None:
+            raise ValueError(
+                f"Unverified bullet found in approved snapshot: {unverified.get('description', 'Unknown')}"
+            )
\ No newline at end of file
@@ -2,92 +2,270 @@
 Authentication system for the persistent job application platform.
 Simple session-based authentication for now.
 """
+import base64
 import hashlib
+import hmac
+import math
+import os
 import secrets
-from typing import Optional, Dict, Any
+import sqlite3
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from backend.database import PersistentDatabase
 
+# Argon2id cost parameters (OWASP baseline); one hash stays well under a 500ms login budget
+ARGON2_TIME_COST = 3
+ARGON2_MEMORY_COST_KIB = 65536
+ARGON2_PARALLELISM = 2
+
+# Calibration: time cost is raised on faster hardware until one hash takes about this long
+ARGON2_TARGET_SECONDS = 0.25
+ARGON2_MAX_TIME_COST = 16
+
+# Recently verified (user, password) pairs, so repeat logins skip the KDF
+VERIFY_CACHE_SIZE = 1024
+
+# Sessions expire this long after login
+SESSION_TTL_SECONDS = 86400
+# Upper bound on live sessions; the oldest are dropped first once it is reached
+MAX_ACTIVE_SESSIONS = 100_000
+
+# Same response for unknown email and wrong password, so callers cannot tell them apart
+_LOGIN_FAILED = (False, "Invalid email or password", None, None)
+
+# Shared require_auth failure results
+_AUTH_TOKEN_REQUIRED = (False, None, "Authentication token required")
+_AUTH_INVALID_TOKEN = (False, None, "Invalid or expired token")
+
+
+def _new_session_token(_urandom=os.urandom, _b64encode=base64.urlsafe_b64encode) -> str:
+    """Same format as secrets.token_urlsafe(32), with the helpers bound as locals."""
+    return _b64encode(_urandom(32)).rstrip(b"=").decode("ascii")
+
+
+def calibrate_argon2_time_cost(target_seconds: float = ARGON2_TARGET_SECONDS,
+                               memory_cost: int = ARGON2_MEMORY_COST_KIB,
+                               parallelism: int = ARGON2_PARALLELISM, samples: int = 5) -> int:
+    """Pick the time cost whose hash takes about target_seconds on this machine.
+    
+    Hash time grows linearly with the number of passes, so one pass is timed
+    (median of a few samples) and scaled, instead of probing every candidate.
+    Never goes below the ARGON2_TIME_COST baseline.
+    """
+    hasher = PasswordHasher(time_cost=1, memory_cost=memory_cost, parallelism=parallelism)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-probe")
+        timings.append(time.perf_counter() - start)
+    per_pass = max(statistics.median(timings), 1e-6)
+    return min(max(ARGON2_TIME_COST, math.ceil(target_seconds / per_pass)), ARGON2_MAX_TIME_COST)
+
+
+def _session_key(token: str) -> bytes:
+    """Fixed-size digest of a session token; the raw token itself is never kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+# Static salt of the original SHA-256 scheme; only used to verify (and then upgrade) old hashes
+_LEGACY_SALT = b"job_app_platform_salt"
+
 
 class AuthManager:
     """Simple authentication manager."""
     
-    def __init__(self, db: PersistentDatabase):
+    def __init__(self, db: PersistentDatabase, time_cost: Optional[int] = None,
+                 memory_cost: int = ARGON2_MEMORY_COST_KIB, parallelism: int = ARGON2_PARALLELISM,
+                 session_ttl: int = SESSION_TTL_SECONDS):
         self.db = db
-        self.active_sessions: Dict[str, int] = {}  # token -> user_id
+        if time_cost is None:
+            time_cost = self._calibrated_time_cost(memory_cost, parallelism)
+        self.session_ttl = session_ttl
+        # blake2b(token) -> (user_id, expires_at), in login order (so also in expiry order)
+        self.active_sessions: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # Argon2id; salt is random per hash. Raising the costs later upgrades hashes on next login
+        self.password_hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        # Verified against when the email is unknown, so that path costs the same as a wrong password
+        self._dummy_hash = self.hash_password(secrets.token_urlsafe(16))
+        # HMAC(process secret, user id + password) -> (user id, stored hash it verified against).
+        # Only successful verifications are cached; the secret never leaves this process.
+        self._verify_cache: "OrderedDict[bytes, Tuple[int, str]]" = OrderedDict()
+        self._verify_cache_secret = secrets.token_bytes(32)
+        self._verify_cache_lock = threading.Lock()
+    
+    def _calibrated_time_cost(self, memory_cost: int, parallelism: int) -> int:
+        """Time cost stored in the DB, calibrated on first start so all workers agree.
+        
+        Workers with different costs would keep rehashing each other's hashes on login.
+        Delete the setting to recalibrate after moving to new hardware.
+        """
+        key = f"argon2_time_cost:m={memory_cost},p={parallelism}"
+        stored = self.db.get_setting(key)
+        if stored is not None:
+            return int(stored)
+        time_cost = calibrate_argon2_time_cost(memory_cost=memory_cost, parallelism=parallelism)
+        self.db.save_setting(key, str(time_cost))
+        return time_cost
     
     def hash_password(self, password: str) -> str:
-        """Hash password with salt."""
-        salt = "job_app_platform_salt"  # In production, use random salt per user
-        return hashlib.sha256((password + salt).encode()).hexdigest()
+        """Hash password with Argon2id (PHC string, includes its own salt)."""
+        return self.password_hasher.hash(password)
+    
+    def _legacy_hash_password(self, password: str) -> str:
+        """Hash password the way accounts created before Argon2 were stored."""
+        return hashlib.sha256(password.encode() + _LEGACY_SALT).hexdigest()
+    
+    def verify_password(self, password: str, stored_hash: str) -> tuple[bool, bool]:
+        """Check password against a stored hash. Returns (valid, needs_rehash)."""
+        if stored_hash.startswith("$argon2"):
+            try:
+                self.password_hasher.verify(stored_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False, False
+            return True, self.password_hasher.check_needs_rehash(stored_hash)
+        
+        # Legacy SHA-256 hash: valid logins are upgraded to Argon2id (constant-time compare)
+        return hmac.compare_digest(self._legacy_hash_password(password), stored_hash), True
+    
+    def _verify_cache_key(self, user_id: int, password: str) -> bytes:
+        message = f"{user_id}\0{password}".encode()
+        return hmac.new(self._verify_cache_secret, message, hashlib.sha256).digest()
+    
+    def _is_cached_verification(self, key: bytes, user_id: int, stored_hash: str) -> bool:
+        with self._verify_cache_lock:
+            entry = self._verify_cache.get(key)
+            if entry is None or entry != (user_id, stored_hash):
+                return False
+            self._verify_cache.move_to_end(key)
+            return True
+    
+    def _cache_verification(self, key: bytes, user_id: int, stored_hash: str):
+        with self._verify_cache_lock:
+            self._verify_cache[key] = (user_id, stored_hash)
+            self._verify_cache.move_to_end(key)
+            if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+                self._verify_cache.popitem(last=False)
+    
+    def _forget_verifications(self, user_id: int):
+        """Drop cached verifications for a user (logout, password change)."""
+        with self._verify_cache_lock:
+            for key in [k for k, (cached_id, _) in self._verify_cache.items() if cached_id == user_id]:
+                del self._verify_cache[key]
     
     def register_user(self, email: str, password: str) -> tuple[bool, str, Optional[int]]:
         """Register a new user."""
+        # Check for an existing user first: the indexed lookup is far cheaper than the KDF,
+        # so duplicate registrations never pay for (or queue up) a password hash
         try:
-            # Check if user already exists
             existing_user = self.db.get_user_by_email(email)
-            if existing_user:
-                return False, "User with this email already exists", None
-            
-            # Hash password and create user
-            password_hash = self.hash_password(password)
+        except sqlite3.Error as e:
+            return False, f"Registration failed: {str(e)}", None
+        if existing_user:
+            return False, "User with this email already exists", None
+        
+        password_hash = self.hash_password(password)
+        try:
             user_id = self.db.create_user(email, password_hash)
-            
-            return True, "User registered successfully", user_id
-            
-        except Exception as e:
+        except sqlite3.Error as e:
             return False, f"Registration failed: {str(e)}", None
+        
+        return True, "User registered successfully", user_id
     
     def login_user(self, email: str, password: str) -> tuple[bool, str, Optional[str], Optional[int]]:
         """Login user and return session token."""
         try:
-            # Get user by email
             user = self.db.get_user_by_email(email)
-            if not user:
-                return False, "Invalid email or password", None, None
-            
-            # Check if user is active
-            if not user["is_active"]:
-                return False, "Account is deactivated", None, None
-            
-            # Verify password
-            password_hash = self.hash_password(password)
-            if password_hash != user["password_hash"]:
-                return False, "Invalid email or password", None, None
-            
-            # Generate session token
-            token = secrets.token_urlsafe(32)
-            self.active_sessions[token] = user["id"]
+        except sqlite3.Error as e:
+            return False, f"Login failed: {str(e)}", None, None
+        if not user:
+            self.verify_password(password, self._dummy_hash)
+            return _LOGIN_FAILED
+        
+        # Check if user is active
+        if not user["is_active"]:
+            return False, "Account is deactivated", None, None
+        
+        # Verify password (a recent successful check against the same stored hash skips the KDF)
+        cache_key = self._verify_cache_key(user["id"], password)
+        if not self._is_cached_verification(cache_key, user["id"], user["password_hash"]):
+            is_valid, needs_rehash = self.verify_password(password, user["password_hash"])
+            if not is_valid:
+                return _LOGIN_FAILED
             
-            # Update last login
+            stored_hash = user["password_hash"]
+            if needs_rehash:
+                stored_hash = self.hash_password(password)
+                try:
+                    self.db.update_password_hash(user["id"], stored_hash)
+                except sqlite3.Error:
+                    stored_hash = user["password_hash"]  # upgrade is retried on the next login
+            self._cache_verification(cache_key, user["id"], stored_hash)
+        
+        # Generate session token
+        token = _new_session_token()
+        self._store_session(_session_key(token), user["id"])
+        
+        # Update last login (best effort; the session is already valid)
+        try:
             self.db.update_last_login(user["id"])
-            
-            return True, "Login successful", token, user["id"]
-            
-        except Exception as e:
-            return False, f"Login failed: {str(e)}", None, None
+        except sqlite3.Error:
+            pass
+        
+        return True, "Login successful", token, user["id"]
+    
+    def _store_session(self, key: bytes, user_id: int):
+        """Add a session, first reclaiming expired ones and then the oldest beyond the cap."""
+        now = time.monotonic()
+        sessions = self.active_sessions
+        with self._sessions_lock:
+            while sessions:
+                oldest_key, (_, expires_at) = next(iter(sessions.items()))
+                if expires_at > now and len(sessions) < MAX_ACTIVE_SESSIONS:
+                    break
+                del sessions[oldest_key]
+            sessions[key] = (user_id, now + self.session_ttl)
+    
+    def _session_user(self, key: bytes) -> Optional[int]:
+        """User ID for a session key, dropping the session if it has expired."""
+        with self._sessions_lock:
+            entry = self.active_sessions.get(key)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self.active_sessions[key]
+                return None
+            return user_id
     
     def logout_user(self, token: str) -> bool:
         """Logout user by removing session token."""
-        if token in self.active_sessions:
-            del self.active_sessions[token]
-            return True
-        return False
+        key = _session_key(token)
+        # Lookup, expiry check and removal happen under one lock hold (an expired entry is just reclaimed)
+        with self._sessions_lock:
+            entry = self.active_sessions.pop(key, None)
+            if entry is None or time.monotonic() >= entry[1]:
+                return False
+        self._forget_verifications(entry[0])
+        return True
     
     def get_user_from_token(self, token: str) -> Optional[int]:
         """Get user ID from session token."""
-        return self.active_sessions.get(token)
+        return self._session_user(_session_key(token))
     
     def is_authenticated(self, token: str) -> bool:
         """Check if token is valid."""
-        return token in self.active_sessions
+        return self._session_user(_session_key(token)) is not None
     
     def require_auth(self, token: Optional[str]) -> tuple[bool, Optional[int], str]:
         """Require authentication and return user ID."""
         if not token:
-            return False, None, "Authentication token required"
-        
-        user_id = self.get_user_from_token(token)
-        if not user_id:
-            return False, None, "Invalid or expired token"
-        
-        return True, user_id, "Authenticated"
\ No newline at end of file
+            return _AUTH_TOKEN_REQUIRED
+        if (user_id := self._session_user(_session_key(token))) is None:
+            return _AUTH_INVALID_TOKEN
+        return True, user_id, "Authenticated"
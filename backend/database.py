@@ -2,12 +2,98 @@
 Database models and connection for the persistent job application platform.
 Supports user profiles, job listings, and application history.
 """
+import hashlib
 import sqlite3
-import json
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import uuid
+import orjson
+from schemas.user_profile_schema import UserProfile
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string for TEXT columns."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_loads = orjson.loads
+
+# Large JSON documents (profile snapshots, artifact packs) are stored zlib-compressed
+_COMPRESSION_LEVEL = 3
+
+
+def _pack(obj: Any) -> bytes:
+    """Serialize and compress a JSON document into a BLOB."""
+    return zlib.compress(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), _COMPRESSION_LEVEL)
+
+
+def _unpack(value) -> Any:
+    """Inverse of _pack; rows written before compression are plain JSON TEXT."""
+    if isinstance(value, bytes):
+        value = zlib.decompress(value)
+    return orjson.loads(value)
+
+# Result columns (and dict keys) of the list queries
+_JOB_LIST_COLUMNS = (
+    "job_id", "company", "role", "location", "required_skills", "min_experience_years",
+    "description", "salary_range", "job_type", "posted_date", "expires_date", "created_at",
+)
+_HISTORY_COLUMNS = (
+    "id", "run_id", "job_id", "company", "role", "status", "skip_reason", "receipt_id", "timestamp", "created_at",
+)
+
+# application_history.timestamp is stored as integer microseconds since the epoch
+_MICROSECONDS = 1_000_000
+
+
+def to_history_timestamp(seconds: float) -> int:
+    """Convert an epoch-seconds timestamp to the integer form stored in application_history."""
+    return round(seconds * _MICROSECONDS)
+
+
+# StudentArtifactPack keys checked before engine execution (tuples keep error order stable)
+_REQUIRED_STUDENT_KEYS = ("source_resume_hash", "skill_vocab", "education", "projects", "constraints")
+_REQUIRED_STUDENT_KEYS_SET = frozenset(_REQUIRED_STUDENT_KEYS)
+_REQUIRED_CONSTRAINT_KEYS = ("min_match_score", "max_apps_per_day")
+_REQUIRED_CONSTRAINT_KEYS_SET = frozenset(_REQUIRED_CONSTRAINT_KEYS)
+
+# Digests of profiles that recently passed UserProfile validation (saving an unchanged profile skips it)
+_VALIDATED_PROFILES_SIZE = 256
+_validated_profiles: "OrderedDict[bytes, None]" = OrderedDict()
+_validated_profiles_lock = threading.Lock()
+
+
+# Built when the UserProfile class is created (pydantic v2 does not defer it by default)
+_validate_user_profile = UserProfile.__pydantic_validator__.validate_python
+
+
+def _json_digest(obj: Any) -> bytes:
+    """Order-independent digest of a JSON document (keys are sorted)."""
+    canonical = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+# Bump whenever init_tables changes, so existing databases rerun the DDL and migrations
+SCHEMA_VERSION = 2
+
+# Prepared statements kept per connection (the default of 128 is easily exceeded once the
+# scheduler's ad hoc SQL is added to the regular queries)
+_STATEMENT_CACHE_SIZE = 512
+
+# Per-connection settings: these do not persist in the database file, so every handle needs them
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # safe with WAL; commits no longer fsync every page
+    "PRAGMA cache_size=-16000",  # ~16MB page cache
+    "PRAGMA mmap_size=268435456",  # 256MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",  # wait for a writer instead of failing with "database is locked"
+    "PRAGMA foreign_keys=ON",
+)
 
 
 class PersistentDatabase:
@@ -15,37 +101,84 @@ class PersistentDatabase:
     
     def __init__(self, db_path: str = "../data/platform.db"):
         self.db_path = db_path
+        # One long-lived connection per thread; all of them are also tracked (keyed by a weak
+        # reference to the owning thread) so close() can reach them and dead threads' get closed
+        self._local = threading.local()
+        self._connections: Dict[weakref.ref, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._generation = 0  # bumped by close(); threads holding an older connection reopen
         Path(db_path).parent.mkdir(exist_ok=True)
+        with self.get_connection() as conn:
+            # WAL is stored in the database file, so setting it once covers all later connections
+            conn.execute("PRAGMA journal_mode=WAL")
         self.init_tables()
     
     def get_connection(self):
-        """Get database connection."""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use.
+        
+        Use it as `with db.get_connection() as conn:`; the block commits (or rolls
+        back) but leaves the connection open for the next call on this thread.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None or local.generation != self._generation:
+            # check_same_thread=False only so close() can close it from the shutdown thread;
+            # the connection is otherwise used solely by the thread that opened it
+            conn = sqlite3.connect(
+                self.db_path, cached_statements=_STATEMENT_CACHE_SIZE, check_same_thread=False
+            )
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with self._connections_lock:
+                self._close_dead_thread_connections()
+                self._connections[weakref.ref(threading.current_thread())] = conn
+                local.generation = self._generation
+            local.conn = conn
+        return conn
+    
+    def _close_dead_thread_connections(self):
+        """Close connections whose thread has exited (caller holds _connections_lock).
+        
+        Threadpool workers come and go, so without this every retired worker would keep
+        its connection (and file descriptors) open until close().
+        """
+        for thread_ref in list(self._connections):
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                try:
+                    self._connections.pop(thread_ref).close()
+                except sqlite3.Error:
+                    pass
     
     def validate_user_profile(self, profile: dict):
         """Validate user profile against UserProfile schema (NEW FORMAT)."""
-        from schemas.user_profile_schema import UserProfile
+        try:
+            digest = _json_digest(profile)
+        except TypeError as e:
+            raise ValueError(f"UserProfile validation failed: {e}")
+        
+        with _validated_profiles_lock:
+            if digest in _validated_profiles:
+                _validated_profiles.move_to_end(digest)
+                return True
         
         try:
-            # Validate using the new UserProfile schema
-            validated_profile = UserProfile(**profile)
-            return True
+            # Validate using the new UserProfile schema (core validator directly; the model is discarded)
+            _validate_user_profile(profile)
         except Exception as e:
             raise ValueError(f"UserProfile validation failed: {e}")
+        
+        with _validated_profiles_lock:
+            _validated_profiles[digest] = None
+            if len(_validated_profiles) > _VALIDATED_PROFILES_SIZE:
+                _validated_profiles.popitem(last=False)
+        return True
     
     def validate_student_profile(self, profile: dict):
         """Validate student profile against canonical schema (LEGACY - for engine execution only)."""
-        REQUIRED_TOP_LEVEL_KEYS = [
-            "source_resume_hash",
-            "skill_vocab", 
-            "education",
-            "projects",
-            "constraints"
-        ]
-        
-        for key in REQUIRED_TOP_LEVEL_KEYS:
-            if key not in profile:
-                raise ValueError(f"StudentArtifactPack invalid: missing '{key}'")
+        if not profile.keys() >= _REQUIRED_STUDENT_KEYS_SET:
+            missing = next(key for key in _REQUIRED_STUDENT_KEYS if key not in profile)
+            raise ValueError(f"StudentArtifactPack invalid: missing '{missing}'")
         
         # Education
         if not isinstance(profile["education"], list):
@@ -58,23 +191,17 @@ class PersistentDatabase:
         for project in profile["projects"]:
             if "bullets" not in project:
                 raise ValueError("StudentArtifactPack invalid: project missing bullets")
-            
-            for bullet in project["bullets"]:
-                if not bullet.get("verified", False):
-                    raise ValueError("StudentArtifactPack invalid: all bullets must be verified for engine execution")
+            if not all(bullet.get("verified", False) for bullet in project["bullets"]):
+                raise ValueError("StudentArtifactPack invalid: all bullets must be verified for engine execution")
         
         # Constraints (AUTONOMY BLOCKER)
         constraints = profile["constraints"]
-        REQUIRED_CONSTRAINT_KEYS = [
-            "min_match_score",
-            "max_apps_per_day"
-        ]
-        
-        for key in REQUIRED_CONSTRAINT_KEYS:
-            if key not in constraints:
-                raise ValueError(f"Autopilot blocked: missing constraint '{key}'")
+        if not constraints.keys() >= _REQUIRED_CONSTRAINT_KEYS_SET:
+            missing = next(key for key in _REQUIRED_CONSTRAINT_KEYS if key not in constraints)
+            raise ValueError(f"Autopilot blocked: missing constraint '{missing}'")
         
-        if constraints["min_match_score"] < 0 or constraints["min_match_score"] > 1:
+        min_match_score = constraints["min_match_score"]
+        if min_match_score < 0 or min_match_score > 1:
             raise ValueError("Invalid min_match_score: must be between 0 and 1")
         
         if constraints["max_apps_per_day"] <= 0:
@@ -83,8 +210,12 @@ class PersistentDatabase:
         return True
     
     def init_tables(self):
-        """Initialize database tables for persistent platform."""
+        """Initialize database tables for persistent platform (skipped when the schema is current)."""
         with self.get_connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                self.optimize()
+                return
+            
             conn.executescript("""
                 -- Users table (authentication and basic info)
                 CREATE TABLE IF NOT EXISTS users (
@@ -131,7 +262,7 @@ class PersistentDatabase:
                 CREATE TABLE IF NOT EXISTS autopilot_runs (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
-                    profile_snapshot TEXT NOT NULL,  -- JSON snapshot of profile at run time
+                    profile_snapshot BLOB NOT NULL,  -- zlib-compressed JSON snapshot of profile at run time
                     job_ids TEXT NOT NULL,  -- JSON array of job IDs processed
                     status TEXT NOT NULL,  -- running, completed, failed
                     summary_data TEXT,  -- JSON summary (queued, skipped, submitted, etc.)
@@ -152,7 +283,7 @@ class PersistentDatabase:
                     status TEXT NOT NULL,  -- queued, skipped, submitted, failed, retried
                     skip_reason TEXT,
                     receipt_id TEXT,
-                    timestamp REAL NOT NULL,
+                    timestamp INTEGER NOT NULL,  -- microseconds since the epoch
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
                     FOREIGN KEY (run_id) REFERENCES autopilot_runs (id) ON DELETE CASCADE
@@ -162,9 +293,10 @@ class PersistentDatabase:
                 CREATE TABLE IF NOT EXISTS draft_artifacts (
                     id TEXT PRIMARY KEY,  -- UUID
                     user_id INTEGER NOT NULL,
-                    student_artifact_pack TEXT NOT NULL,  -- JSON blob
+                    student_artifact_pack BLOB NOT NULL,  -- zlib-compressed JSON
                     status TEXT NOT NULL DEFAULT 'DRAFT',
                     source_profile_hash TEXT NOT NULL,
+                    content_hash BLOB,  -- digest of student_artifact_pack, to skip unchanged re-saves
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
                 );
@@ -172,7 +304,7 @@ class PersistentDatabase:
                 CREATE TABLE IF NOT EXISTS artifact_snapshots (
                     id TEXT PRIMARY KEY,  -- UUID
                     user_id INTEGER NOT NULL,
-                    student_artifact_pack TEXT NOT NULL,  -- JSON blob (immutable)
+                    student_artifact_pack BLOB NOT NULL,  -- zlib-compressed JSON (immutable)
                     approved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     source_resume_hash TEXT NOT NULL,
                     source_profile_hash TEXT NOT NULL,
@@ -182,21 +314,75 @@ class PersistentDatabase:
                     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
                 );
                 
+                CREATE TABLE IF NOT EXISTS app_settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                
                 -- Indexes for performance
                 CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
                 CREATE INDEX IF NOT EXISTS idx_profiles_user_id ON user_profiles (user_id);
                 CREATE INDEX IF NOT EXISTS idx_profiles_student_id ON user_profiles (student_id);
                 CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON job_listings (job_id);
                 CREATE INDEX IF NOT EXISTS idx_jobs_company ON job_listings (company);
-                CREATE INDEX IF NOT EXISTS idx_jobs_active ON job_listings (is_active);
-                CREATE INDEX IF NOT EXISTS idx_runs_user_id ON autopilot_runs (user_id);
-                CREATE INDEX IF NOT EXISTS idx_history_user_id ON application_history (user_id);
+                CREATE INDEX IF NOT EXISTS idx_jobs_active_created ON job_listings (is_active, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_runs_user_started ON autopilot_runs (user_id, started_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_history_user_ts ON application_history (user_id, timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_history_user_status_ts ON application_history (user_id, status, timestamp DESC);
                 CREATE INDEX IF NOT EXISTS idx_history_job_id ON application_history (job_id);
                 CREATE INDEX IF NOT EXISTS idx_history_status ON application_history (status);
                 CREATE INDEX IF NOT EXISTS idx_draft_artifacts_user_id ON draft_artifacts (user_id);
                 CREATE INDEX IF NOT EXISTS idx_artifact_snapshots_user_id ON artifact_snapshots (user_id);
                 CREATE INDEX IF NOT EXISTS idx_artifact_snapshots_approved_at ON artifact_snapshots (approved_at);
+                
+                -- Covered by the (user_id, ...) composite indexes above
+                DROP INDEX IF EXISTS idx_jobs_active;
+                DROP INDEX IF EXISTS idx_runs_user_id;
+                DROP INDEX IF EXISTS idx_history_user_id;
+            """)
+        self._migrate_history_timestamps()
+        with self.get_connection() as conn:
+            # Columns added after the first release (CREATE TABLE IF NOT EXISTS leaves old tables alone)
+            draft_columns = {row[1] for row in conn.execute("PRAGMA table_info(draft_artifacts)")}
+            if "content_hash" not in draft_columns:
+                conn.execute("ALTER TABLE draft_artifacts ADD COLUMN content_hash BLOB")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.optimize()
+    
+    def _migrate_history_timestamps(self):
+        """One-time conversion of application_history timestamps from float seconds to integer microseconds."""
+        if self.get_setting("history_timestamp_unit") == "us":
+            return
+        with self.get_connection() as conn:
+            # Anything below 1e11 cannot be microseconds (that would be 1970); it is a seconds value
+            conn.execute("""
+                UPDATE application_history
+                SET timestamp = CAST(ROUND(timestamp * 1000000) AS INTEGER)
+                WHERE timestamp < 100000000000
             """)
+        self.save_setting("history_timestamp_unit", "us")
+    
+    def optimize(self):
+        """Refresh query-planner statistics where SQLite thinks they are stale (cheap when nothing changed)."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+    
+    def close(self):
+        """Run PRAGMA optimize and close every thread's connection (called on app shutdown).
+        
+        Closing the last connection checkpoints the WAL into the database file. Later
+        calls to get_connection() open a fresh connection.
+        """
+        with self._connections_lock:
+            connections, self._connections = list(self._connections.values()), {}
+            self._generation += 1
+        for index, conn in enumerate(connections):
+            try:
+                if index == 0:
+                    conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error:
+                pass  # best effort at shutdown
     
     # ==================== USER MANAGEMENT ====================
     
@@ -239,6 +425,32 @@ class PersistentDatabase:
                 UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?
             """, (user_id,))
     
+    def update_password_hash(self, user_id: int, password_hash: str):
+        """Replace a user's stored password hash (e.g. when upgrading the hash scheme)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE users SET password_hash = ? WHERE id = ?
+            """, (password_hash, user_id))
+    
+    # ==================== APP SETTINGS ====================
+    
+    def get_setting(self, key: str) -> Optional[str]:
+        """Get a persisted application setting."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM app_settings WHERE key = ?", (key,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    
+    def save_setting(self, key: str, value: str):
+        """Persist an application setting, replacing any previous value."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO app_settings (key, value) VALUES (?, ?)
+            """, (key, value))
+    
     # ==================== USER PROFILES (SINGLE SOURCE OF TRUTH) ====================
     
     def create_user_profile(self, user_id: int, student_id: str, profile_data: Dict[str, Any], 
@@ -252,7 +464,7 @@ class PersistentDatabase:
             cursor.execute("""
                 INSERT INTO user_profiles (user_id, student_id, profile_data, resume_hash, resume_text)
                 VALUES (?, ?, ?, ?, ?)
-            """, (user_id, student_id, json.dumps(profile_data), resume_hash, resume_text))
+            """, (user_id, student_id, _dumps(profile_data), resume_hash, resume_text))
             return cursor.lastrowid
     
     def get_user_profile(self, user_id: int) -> Optional[Dict[str, Any]]:
@@ -270,7 +482,7 @@ class PersistentDatabase:
                     "id": row[0],
                     "user_id": user_id,
                     "student_id": row[1],
-                    "profile_data": json.loads(row[2]),
+                    "profile_data": _loads(row[2]),
                     "resume_hash": row[3],
                     "resume_text": row[4],
                     "created_at": row[5],
@@ -289,7 +501,7 @@ class PersistentDatabase:
                 UPDATE user_profiles 
                 SET profile_data = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE user_id = ?
-            """, (json.dumps(profile_data), user_id))
+            """, (_dumps(profile_data), user_id))
             
             if cursor.rowcount == 0:
                 raise RuntimeError(f"Profile update failed: no profile found for user_id {user_id}")
@@ -310,7 +522,7 @@ class PersistentDatabase:
                 return {
                     "user_id": row[0],
                     "student_id": student_id,
-                    "profile_data": json.loads(row[1]),
+                    "profile_data": _loads(row[1]),
                     "resume_hash": row[2],
                     "resume_text": row[3],
                     "created_at": row[4],
@@ -321,20 +533,34 @@ class PersistentDatabase:
     # ==================== JOB LISTINGS ====================
     
     def add_job_listing(self, job_data: Dict[str, Any]) -> int:
-        """Add a new job listing."""
+        """Add a job listing, or update (and reactivate) the existing row with the same job_id."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Upsert in place rather than INSERT OR REPLACE, which deletes and reinserts the row
             cursor.execute("""
-                INSERT OR REPLACE INTO job_listings 
+                INSERT INTO job_listings 
                 (job_id, company, role, location, required_skills, min_experience_years, 
                  description, salary_range, job_type, posted_date, expires_date)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    company = excluded.company,
+                    role = excluded.role,
+                    location = excluded.location,
+                    required_skills = excluded.required_skills,
+                    min_experience_years = excluded.min_experience_years,
+                    description = excluded.description,
+                    salary_range = excluded.salary_range,
+                    job_type = excluded.job_type,
+                    posted_date = excluded.posted_date,
+                    expires_date = excluded.expires_date,
+                    is_active = TRUE
+                RETURNING id
             """, (
                 job_data["job_id"],
                 job_data["company"],
                 job_data["role"],
                 job_data["location"],
-                json.dumps(job_data["required_skills"]),
+                _dumps(job_data["required_skills"]),
                 job_data["min_experience_years"],
                 job_data.get("description"),
                 job_data.get("salary_range"),
@@ -342,37 +568,26 @@ class PersistentDatabase:
                 job_data.get("posted_date"),
                 job_data.get("expires_date")
             ))
-            return cursor.lastrowid
+            return cursor.fetchone()[0]
     
     def get_active_job_listings(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get active job listings."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT job_id, company, role, location, required_skills, min_experience_years,
-                       description, salary_range, job_type, posted_date, expires_date, created_at
+            cursor.execute(f"""
+                SELECT {", ".join(_JOB_LIST_COLUMNS)}
                 FROM job_listings 
                 WHERE is_active = TRUE
                 ORDER BY created_at DESC
                 LIMIT ?
             """, (limit,))
             
+            # Build dicts straight off the cursor instead of materialising fetchall() first
             jobs = []
-            for row in cursor.fetchall():
-                jobs.append({
-                    "job_id": row[0],
-                    "company": row[1],
-                    "role": row[2],
-                    "location": row[3],
-                    "required_skills": json.loads(row[4]),
-                    "min_experience_years": row[5],
-                    "description": row[6],
-                    "salary_range": row[7],
-                    "job_type": row[8],
-                    "posted_date": row[9],
-                    "expires_date": row[10],
-                    "created_at": row[11]
-                })
+            for row in cursor:
+                job = dict(zip(_JOB_LIST_COLUMNS, row))
+                job["required_skills"] = _loads(job["required_skills"])
+                jobs.append(job)
             return jobs
     
     def get_job_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
@@ -392,7 +607,7 @@ class PersistentDatabase:
                     "company": row[1],
                     "role": row[2],
                     "location": row[3],
-                    "required_skills": json.loads(row[4]),
+                    "required_skills": _loads(row[4]),
                     "min_experience_years": row[5],
                     "description": row[6],
                     "salary_range": row[7],
@@ -402,6 +617,37 @@ class PersistentDatabase:
                 }
             return None
     
+    def get_jobs_by_ids(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get active job listings for several IDs in one query, in the order requested."""
+        jobs_by_id = {}
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # The IDs travel as one JSON array, so the statement is the same for any list length
+            cursor.execute("""
+                SELECT job_id, company, role, location, required_skills, min_experience_years,
+                       description, salary_range, job_type, posted_date, expires_date
+                FROM job_listings
+                WHERE job_id IN (SELECT value FROM json_each(?)) AND is_active = TRUE
+            """, (_dumps(list(dict.fromkeys(job_ids))),))
+            
+            for row in cursor:
+                jobs_by_id[row[0]] = {
+                    "job_id": row[0],
+                    "company": row[1],
+                    "role": row[2],
+                    "location": row[3],
+                    "required_skills": _loads(row[4]),
+                    "min_experience_years": row[5],
+                    "description": row[6],
+                    "salary_range": row[7],
+                    "job_type": row[8],
+                    "posted_date": row[9],
+                    "expires_date": row[10]
+                }
+        
+        return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+    
     # ==================== AUTOPILOT RUNS ====================
     
     def create_autopilot_run(self, user_id: int, job_ids: List[str]) -> int:
@@ -411,7 +657,7 @@ class PersistentDatabase:
             cursor.execute("""
                 INSERT INTO autopilot_runs (user_id, job_ids, status, profile_snapshot)
                 VALUES (?, ?, 'running', '{}')
-            """, (user_id, json.dumps(job_ids)))
+            """, (user_id, _dumps(job_ids)))
             return cursor.lastrowid
     
     def create_autopilot_run_with_profile(self, user_id: int, profile_snapshot: Dict[str, Any], job_ids: List[str]) -> int:
@@ -424,38 +670,19 @@ class PersistentDatabase:
             cursor.execute("""
                 INSERT INTO autopilot_runs (user_id, profile_snapshot, job_ids, status)
                 VALUES (?, ?, ?, 'running')
-            """, (user_id, json.dumps(profile_snapshot), json.dumps(job_ids)))
+            """, (user_id, _pack(profile_snapshot), _dumps(job_ids)))
             return cursor.lastrowid
     
-    def update_autopilot_run_success(self, run_id: int, summary_data: Dict[str, Any]):
-        """Mark autopilot run as completed successfully."""
+    def complete_autopilot_run(self, run_id: int, summary_data: Dict[str, Any], log_path: Optional[str] = None):
+        """Mark autopilot run as completed (log_path is left unchanged when not given)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE autopilot_runs 
-                SET status = 'completed', summary_data = ?, completed_at = CURRENT_TIMESTAMP
+                SET status = 'completed', summary_data = ?, log_path = COALESCE(?, log_path),
+                    completed_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            """, (json.dumps(summary_data), run_id))
-    
-    def update_autopilot_run_error(self, run_id: int, error_message: str):
-        """Mark autopilot run as failed."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE autopilot_runs 
-                SET status = 'failed', summary_data = ?, completed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (json.dumps({"error": error_message}), run_id))
-    
-    def complete_autopilot_run(self, run_id: int, summary_data: Dict[str, Any], log_path: str):
-        """Mark autopilot run as completed."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE autopilot_runs 
-                SET status = 'completed', summary_data = ?, log_path = ?, completed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (json.dumps(summary_data), log_path, run_id))
+            """, (_dumps(summary_data), log_path, run_id))
     
     def fail_autopilot_run(self, run_id: int, error_message: str):
         """Mark autopilot run as failed."""
@@ -465,7 +692,11 @@ class PersistentDatabase:
                 UPDATE autopilot_runs 
                 SET status = 'failed', summary_data = ?, completed_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            """, (json.dumps({"error": error_message}), run_id))
+            """, (_dumps({"error": error_message}), run_id))
+    
+    # Older names used by app.py and the scheduler
+    update_autopilot_run_success = complete_autopilot_run
+    update_autopilot_run_error = fail_autopilot_run
     
     def get_user_autopilot_runs(self, user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
         """Get autopilot runs for a user."""
@@ -483,9 +714,9 @@ class PersistentDatabase:
             for row in cursor.fetchall():
                 runs.append({
                     "id": row[0],
-                    "job_ids": json.loads(row[1]),
+                    "job_ids": _loads(row[1]),
                     "status": row[2],
-                    "summary_data": json.loads(row[3]) if row[3] else {},
+                    "summary_data": _loads(row[3]) if row[3] else {},
                     "log_path": row[4],
                     "started_at": row[5],
                     "completed_at": row[6]
@@ -496,42 +727,55 @@ class PersistentDatabase:
     
     def save_application_history(self, user_id: int, run_id: int, applications: List[Dict[str, Any]]):
         """Save application history from tracker."""
+        if not applications:
+            return
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            for app in applications:
-                # Use company and role from application data if available, otherwise lookup
-                company = app.get("company")
-                role = app.get("role")
-                
-                if not company or not role:
-                    # Fallback to job lookup if not provided
-                    job_details = self.get_job_by_id(app["job_id"])
-                    company = company or (job_details["company"] if job_details else "Unknown")
-                    role = role or (job_details["role"] if job_details else "Unknown")
-                
-                cursor.execute("""
-                    INSERT INTO application_history 
-                    (user_id, run_id, job_id, company, role, status, skip_reason, receipt_id, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id,
-                    run_id,
+            # Company and role come from the application data if available, else from the
+            # active job listing (joined in SQL), else "Unknown". The rows travel as one JSON
+            # array, so a single statement handles any number of applications.
+            rows = [
+                [
                     app["job_id"],
-                    company,
-                    role,
+                    app.get("company") or None,
+                    app.get("role") or None,
                     app["status"],
                     app.get("reason"),
                     app.get("receipt_id"),
-                    app["timestamp"]
-                ))
+                    to_history_timestamp(app["timestamp"]),
+                ]
+                for app in applications
+            ]
+            cursor.execute("""
+                WITH v AS (
+                    SELECT key AS position,
+                           json_extract(value, '$[0]') AS job_id,
+                           json_extract(value, '$[1]') AS company,
+                           json_extract(value, '$[2]') AS role,
+                           json_extract(value, '$[3]') AS status,
+                           json_extract(value, '$[4]') AS reason,
+                           json_extract(value, '$[5]') AS receipt_id,
+                           json_extract(value, '$[6]') AS timestamp
+                    FROM json_each(?)
+                )
+                INSERT INTO application_history 
+                (user_id, run_id, job_id, company, role, status, skip_reason, receipt_id, timestamp)
+                SELECT ?, ?, v.job_id,
+                       COALESCE(v.company, j.company, 'Unknown'),
+                       COALESCE(v.role, j.role, 'Unknown'),
+                       v.status, v.reason, v.receipt_id, v.timestamp
+                FROM v LEFT JOIN job_listings j ON j.job_id = v.job_id AND j.is_active = TRUE
+                ORDER BY v.position
+            """, (_dumps(rows), user_id, run_id))
     
     def get_user_application_history(self, user_id: int, limit: int = 100, status_filter: str = None) -> List[Dict[str, Any]]:
         """Get application history for a user."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            query = """
-                SELECT id, run_id, job_id, company, role, status, skip_reason, receipt_id, timestamp, created_at
+            query = f"""
+                SELECT {", ".join(_HISTORY_COLUMNS)}
                 FROM application_history 
                 WHERE user_id = ?
             """
@@ -547,19 +791,10 @@ class PersistentDatabase:
             cursor.execute(query, params)
             
             history = []
-            for row in cursor.fetchall():
-                history.append({
-                    "id": row[0],
-                    "run_id": row[1],
-                    "job_id": row[2],
-                    "company": row[3],
-                    "role": row[4],
-                    "status": row[5],
-                    "skip_reason": row[6],
-                    "receipt_id": row[7],
-                    "timestamp": row[8],
-                    "created_at": row[9]
-                })
+            for row in cursor:
+                entry = dict(zip(_HISTORY_COLUMNS, row))
+                entry["timestamp"] = entry["timestamp"] / _MICROSECONDS  # callers work in epoch seconds
+                history.append(entry)
             return history
     
     def delete_application_history_entry(self, user_id: int, history_id: int) -> bool:
@@ -597,25 +832,37 @@ class PersistentDatabase:
                 GROUP BY status
             """, (user_id,))
             
-            stats = {}
-            for row in cursor.fetchall():
-                stats[row[0]] = row[1]
-            
-            return stats
+            # Served by idx_history_user_status_ts as a covering index-only scan
+            return dict(cursor)
 
     # ==================== ARTIFACT WORKFLOW (NEW) ====================
     
     def save_draft_artifact(self, draft_id: str, user_id: int, student_artifact_pack: Dict[str, Any], 
-                           source_profile_hash: str) -> bool:
-        """Save draft artifact to database."""
+                           source_profile_hash: str) -> Optional[str]:
+        """Save draft artifact to database and return the id of the stored draft.
+        
+        If the user's current draft already has the same profile hash and content,
+        nothing is written and that draft's id is returned instead of draft_id.
+        """
+        content_hash = _json_digest(student_artifact_pack)
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, source_profile_hash, content_hash, status FROM draft_artifacts
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+            """, (user_id,))
+            row = cursor.fetchone()
+            if row is not None and row[1:] == (source_profile_hash, content_hash, "DRAFT"):
+                return row[0]
+            
             cursor.execute("""
                 INSERT OR REPLACE INTO draft_artifacts 
-                (id, user_id, student_artifact_pack, source_profile_hash)
-                VALUES (?, ?, ?, ?)
-            """, (draft_id, user_id, json.dumps(student_artifact_pack), source_profile_hash))
-            return cursor.rowcount > 0
+                (id, user_id, student_artifact_pack, source_profile_hash, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+            """, (draft_id, user_id, _pack(student_artifact_pack), source_profile_hash, content_hash))
+            return draft_id if cursor.rowcount > 0 else None
     
     def get_draft_artifact(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get current draft artifact for user."""
@@ -629,17 +876,18 @@ class PersistentDatabase:
                 LIMIT 1
             """, (user_id,))
             row = cursor.fetchone()
+            if row is None:
+                return None
             
-            if row:
-                return {
-                    "id": row[0],
-                    "user_id": user_id,
-                    "student_artifact_pack": json.loads(row[1]),
-                    "status": row[2],
-                    "source_profile_hash": row[3],
-                    "created_at": row[4]
-                }
-            return None
+            draft_id, pack_blob, status, source_profile_hash, created_at = row
+            return {
+                "id": draft_id,
+                "user_id": user_id,
+                "student_artifact_pack": _unpack(pack_blob),
+                "status": status,
+                "source_profile_hash": source_profile_hash,
+                "created_at": created_at
+            }
     
     def save_artifact_snapshot(self, snapshot_id: str, user_id: int, student_artifact_pack: Dict[str, Any],
                               source_resume_hash: str, source_profile_hash: str, 
@@ -653,9 +901,9 @@ class PersistentDatabase:
                  approval_metadata, integrity_hash)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
-                snapshot_id, user_id, json.dumps(student_artifact_pack), 
+                snapshot_id, user_id, _pack(student_artifact_pack), 
                 source_resume_hash, source_profile_hash, 
-                json.dumps(approval_metadata), integrity_hash
+                _dumps(approval_metadata), integrity_hash
             ))
             return cursor.rowcount > 0
     
@@ -672,20 +920,22 @@ class PersistentDatabase:
                 LIMIT 1
             """, (user_id,))
             row = cursor.fetchone()
+            if row is None:
+                return None
             
-            if row:
-                return {
-                    "id": row[0],
-                    "user_id": user_id,
-                    "student_artifact_pack": json.loads(row[1]),
-                    "approved_at": row[2],
-                    "source_resume_hash": row[3],
-                    "source_profile_hash": row[4],
-                    "frozen": True,  # Always true for snapshots
-                    "approval_metadata": json.loads(row[5]),
-                    "integrity_hash": row[6]
-                }
-            return None
+            (snapshot_id, pack_blob, approved_at, source_resume_hash,
+             source_profile_hash, metadata_json, integrity_hash) = row
+            return {
+                "id": snapshot_id,
+                "user_id": user_id,
+                "student_artifact_pack": _unpack(pack_blob),
+                "approved_at": approved_at,
+                "source_resume_hash": source_resume_hash,
+                "source_profile_hash": source_profile_hash,
+                "frozen": True,  # Always true for snapshots
+                "approval_metadata": _loads(metadata_json),
+                "integrity_hash": integrity_hash
+            }
     
     def delete_draft_artifacts(self, user_id: int) -> bool:
         """Delete all draft artifacts for user (cleanup after approval)."""
@@ -694,4 +944,19 @@ class PersistentDatabase:
             cursor.execute("""
                 DELETE FROM draft_artifacts WHERE user_id = ?
             """, (user_id,))
-            return cursor.rowcount > 0
\ No newline at end of file
+            return cursor.rowcount > 0
+
+
+# Shared instance for services that are not handed a database explicitly
+_INSTANCE: Optional[PersistentDatabase] = None
+_INSTANCE_LOCK = threading.Lock()
+
+
+def get_db() -> PersistentDatabase:
+    """Return the process-wide PersistentDatabase, creating it (and its tables) on first use."""
+    global _INSTANCE
+    if _INSTANCE is None:
+        with _INSTANCE_LOCK:
+            if _INSTANCE is None:
+                _INSTANCE = PersistentDatabase()
+    return _INSTANCE
@@ -2,23 +2,40 @@
 Reusable autopilot engine wrapper.
 Preserves all original logic from main.py while making it callable as a function.
 """
-import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+import orjson
 
 from core.tracker import ApplicationTracker
 from sandbox.portal import SandboxJobPortal
-from core.scorer import score_job_match
+from core.scorer import score_job_matches
 from core.generator import generate_application_content
 from schemas.student_schema import StudentArtifactPack
 from schemas.job_schema import JobListing
-from core.validator import validate_job_for_scoring
+from core.validator import validate_job_for_scoring, lowercase_skill_vocab
+
+# Compiled pydantic-core validators; calling them directly skips BaseModel.__init__ and kwargs unpacking
+_STUDENT_VALIDATOR = StudentArtifactPack.__pydantic_validator__
+_JOB_VALIDATOR = JobListing.__pydantic_validator__
+
+
+def _submit_with_retry(portal: SandboxJobPortal, application: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Submit once, retrying once on failure. Returns (status, receipt_id or error message)."""
+    try:
+        return "submitted", portal.submit_application(application).get("receipt_id")
+    except Exception:
+        try:
+            return "retried", portal.submit_application(application).get("receipt_id")
+        except Exception as e:
+            return "failed", str(e)
 
 
 def load_json(path):
     """Load JSON data from file path."""
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    # orjson parses the raw bytes directly, without decoding to str first
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def run_autopilot(
@@ -44,7 +61,7 @@ def run_autopilot(
     
     # Validate schemas
     try:
-        student = StudentArtifactPack(**student_data)
+        student = _STUDENT_VALIDATOR.validate_python(student_data)
     except Exception as e:
         return {
             "success": False,
@@ -56,7 +73,7 @@ def run_autopilot(
     jobs = []
     for idx, j in enumerate(jobs_data):
         try:
-            jobs.append(JobListing(**j))
+            jobs.append(_JOB_VALIDATOR.validate_python(j))
         except Exception as e:
             return {
                 "success": False,
@@ -74,22 +91,24 @@ def run_autopilot(
     queued, skipped, submitted, failed, retried = 0, 0, 0, 0, 0
     apps_today = 0
 
-    # Process each job (preserving exact original logic)
-    for job in jobs:
+    # Score every job in one batch up front
+    score_results = score_job_matches(student, jobs)
+    skill_vocab_lower = lowercase_skill_vocab(student)
+
+    # Main application loop (preserving exact original logic)
+    for job, score_result in zip(jobs, score_results):
         job_id = job.job_id
         # Track status "queued"
         tracker.track(job_id=job_id, status="queued")
         queued += 1
 
         # Validate job for scoring
-        ok, not_allowed_reason = validate_job_for_scoring(student, job, apps_today)
+        ok, not_allowed_reason = validate_job_for_scoring(student, job, apps_today, skill_vocab_lower)
         if not ok:
             tracker.track(job_id=job_id, status="skipped", reason=not_allowed_reason)
             skipped += 1
             continue
 
-        # Score job
-        score_result = score_job_match(student, job)
         score = score_result["score"]
 
         min_score = student.constraints.min_match_score
@@ -114,31 +133,18 @@ def run_autopilot(
             "content": app_content,
         }
 
-        # Submit to sandbox portal (with retry logic)
-        try:
-            submission_result = portal.submit_application(application)
-            tracker.track(
-                job_id=job_id,
-                status="submitted",
-                receipt_id=submission_result.get("receipt_id")
-            )
-            submitted += 1
-        except Exception as e1:
-            try:
-                submission_result = portal.submit_application(application)
-                tracker.track(
-                    job_id=job_id,
-                    status="retried",
-                    receipt_id=submission_result.get("receipt_id")
-                )
+        # Submit sequentially: the sandbox portal is in-memory work, and a fixed order keeps
+        # receipt ids and the simulated random failures reproducible for a given seed
+        status, detail = _submit_with_retry(portal, application)
+        if status == "failed":
+            tracker.track(job_id=job_id, status="failed", reason=f"Submission failed twice: {detail}")
+            failed += 1
+        else:
+            tracker.track(job_id=job_id, status=status, receipt_id=detail)
+            if status == "submitted":
+                submitted += 1
+            else:
                 retried += 1
-            except Exception as e2:
-                tracker.track(
-                    job_id=job_id,
-                    status="failed",
-                    reason=f"Submission failed twice: {e2}"
-                )
-                failed += 1
         apps_today += 1
 
     summary = {
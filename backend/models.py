@@ -4,12 +4,24 @@ These are separate from the core schemas to maintain separation of concerns.
 """
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, validator
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 
 # ==================== ARTIFACT APPROVAL WORKFLOW ====================
 
+def count_bullets(student_artifact_pack: Dict[str, Any]) -> Tuple[int, int]:
+    """Return (total, verified) bullet counts of a StudentArtifactPack in one pass."""
+    total = verified = 0
+    for project in student_artifact_pack.get("projects", ()):
+        for bullet in project.get("bullets", ()):
+            total += 1
+            if bullet.get("verified", False):
+                verified += 1
+    return total, verified
+
+
 class UserConfirmation(BaseModel):
     """User confirmation data for artifact approval."""
     bullets_verified: List[Dict[str, Any]] = Field(..., description="List of bullet verification confirmations")
@@ -36,6 +48,7 @@ class ArtifactSnapshot(BaseModel):
     source_profile_hash: str = Field(..., description="Hash of source UserProfile for traceability")
     frozen: bool = Field(True, description="Always true - indicates immutability")
     approval_metadata: Dict[str, Any] = Field(..., description="User confirmation and verification metadata")
+    _integrity_hash: Optional[str] = PrivateAttr(default=None)
     
     @validator('frozen')
     def validate_frozen_always_true(cls, v):
@@ -67,10 +80,17 @@ class ArtifactSnapshot(BaseModel):
                 raise ValueError(f'Approval metadata missing required field: {field}')
         return v
     
+    @cached_property
+    def bullet_counts(self) -> Tuple[int, int]:
+        """(total, verified) bullet counts; the pack does not change after approval."""
+        return count_bullets(self.student_artifact_pack)
+    
     def generate_integrity_hash(self) -> str:
-        """Generate cryptographic hash for integrity verification."""
-        content = f"{self.user_id}:{self.source_resume_hash}:{self.approved_at.isoformat()}"
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Generate cryptographic hash for integrity verification (computed once per snapshot)."""
+        if self._integrity_hash is None:
+            content = f"{self.user_id}:{self.source_resume_hash}:{self.approved_at.isoformat()}"
+            self._integrity_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=32).hexdigest()
+        return self._integrity_hash
 
 
 class DraftArtifactPack(BaseModel):
@@ -97,6 +117,11 @@ class DraftArtifactPack(BaseModel):
                 if bullet.get('verified', False):
                     raise ValueError('Draft artifacts cannot contain verified: true bullets')
         return v
+    
+    @cached_property
+    def bullet_counts(self) -> Tuple[int, int]:
+        """(total, verified) bullet counts of the draft pack."""
+        return count_bullets(self.student_artifact_pack)
 
 
 # ==================== AUTHENTICATION ====================
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import logging
 
-from backend.database import PersistentDatabase
+from backend.database import PersistentDatabase, to_history_timestamp
 from backend.ai_agents import rank_jobs_for_user, convert_user_profile_to_student_artifact_pack
 from backend.engine import run_autopilot
 from core.tracker import ApplicationTracker
@@ -53,6 +53,9 @@ class AutonomousAIAgent:
         schedule.every().day.at("09:00").do(self.run_daily_autopilot)
         schedule.every().day.at("14:00").do(self.run_daily_autopilot)  # Twice daily
         
+        # Keep SQLite planner statistics current as application history grows
+        schedule.every(4).hours.do(self.db.optimize)
+        
         # Also run immediately for testing
         schedule.every(30).seconds.do(self.run_daily_autopilot)  # Every 30 seconds for demo
         
@@ -141,7 +144,7 @@ class AutonomousAIAgent:
                 SELECT COUNT(*) FROM application_history 
                 WHERE user_id = ? AND timestamp >= ? AND timestamp <= ?
                 AND status IN ('submitted', 'retried')
-            """, (user_id, today_start, today_end))
+            """, (user_id, to_history_timestamp(today_start), to_history_timestamp(today_end)))
             
             applications_today = cursor.fetchone()[0]
             
@@ -472,7 +475,7 @@ class AutonomousAIAgent:
                 SELECT COUNT(*) FROM application_history 
                 WHERE user_id = ? AND timestamp >= ? AND timestamp <= ?
                 AND status IN ('submitted', 'retried')
-            """, (user_id, today_start, today_end))
+            """, (user_id, to_history_timestamp(today_start), to_history_timestamp(today_end)))
             
             return cursor.fetchone()[0]
             
@@ -8,6 +8,19 @@ from typing import Dict, Any, Optional
 from backend.models import DraftArtifactPack, ArtifactSnapshot
 
 
+# Static parts of the four approval workflow steps; status and timestamp are filled in per call
+_WORKFLOW_STEP_TEMPLATES = (
+    {"step": 1, "name": "Edit Profile", "status": None, "timestamp": None,
+     "description": "Create and edit your user profile"},
+    {"step": 2, "name": "Generate Draft", "status": None, "timestamp": None,
+     "description": "Generate draft artifacts from profile"},
+    {"step": 3, "name": "Review & Approve", "status": None, "timestamp": None,
+     "description": "Review and approve artifacts for engine use"},
+    {"step": 4, "name": "Engine Execution", "status": None, "timestamp": None,
+     "description": "Run autopilot with approved artifacts"},
+)
+
+
 def get_artifact_status_display(
     draft_artifact: Optional[DraftArtifactPack] = None,
     approved_snapshot: Optional[ArtifactSnapshot] = None
@@ -61,17 +74,8 @@ def get_draft_artifact_indicators(draft_artifact: DraftArtifactPack) -> Dict[str
     Returns:
         Draft-specific indicators
     """
-    student_pack = draft_artifact.student_artifact_pack
-    
-    # Count unverified bullets
-    total_bullets = 0
-    unverified_bullets = 0
-    
-    for project in student_pack.get("projects", []):
-        for bullet in project.get("bullets", []):
-            total_bullets += 1
-            if not bullet.get("verified", False):
-                unverified_bullets += 1
+    total_bullets, verified_bullets = draft_artifact.bullet_counts
+    unverified_bullets = total_bullets - verified_bullets
     
     return {
         "is_draft": True,
@@ -79,7 +83,7 @@ def get_draft_artifact_indicators(draft_artifact: DraftArtifactPack) -> Dict[str
         "status_color": "orange",
         "total_bullets": total_bullets,
         "unverified_bullets": unverified_bullets,
-        "verification_progress": f"{total_bullets - unverified_bullets}/{total_bullets} verified",
+        "verification_progress": f"{verified_bullets}/{total_bullets} verified",
         "ready_for_approval": unverified_bullets == 0,
         "warning_message": "⚠️ This is a DRAFT. All bullets must be verified before approval."
     }
@@ -95,17 +99,7 @@ def get_approved_artifact_indicators(approved_snapshot: ArtifactSnapshot) -> Dic
     Returns:
         Approval-specific indicators
     """
-    student_pack = approved_snapshot.student_artifact_pack
-    
-    # Count verified bullets
-    total_bullets = 0
-    verified_bullets = 0
-    
-    for project in student_pack.get("projects", []):
-        for bullet in project.get("bullets", []):
-            total_bullets += 1
-            if bullet.get("verified", False):
-                verified_bullets += 1
+    total_bullets, verified_bullets = approved_snapshot.bullet_counts
     
     return {
         "is_approved": True,
@@ -168,36 +162,16 @@ def format_approval_workflow_status(
     Returns:
         Complete workflow status
     """
-    workflow_steps = [
-        {
-            "step": 1,
-            "name": "Edit Profile",
-            "status": "completed" if user_profile_modified else "pending",
-            "timestamp": user_profile_modified,
-            "description": "Create and edit your user profile"
-        },
-        {
-            "step": 2,
-            "name": "Generate Draft",
-            "status": "completed" if draft_created else "pending",
-            "timestamp": draft_created,
-            "description": "Generate draft artifacts from profile"
-        },
-        {
-            "step": 3,
-            "name": "Review & Approve",
-            "status": "completed" if approved_at else "pending",
-            "timestamp": approved_at,
-            "description": "Review and approve artifacts for engine use"
-        },
-        {
-            "step": 4,
-            "name": "Engine Execution",
-            "status": "enabled" if approved_at else "disabled",
-            "timestamp": None,
-            "description": "Run autopilot with approved artifacts"
-        }
-    ]
+    workflow_steps = [dict(template) for template in _WORKFLOW_STEP_TEMPLATES]
+    step_states = (
+        ("completed" if user_profile_modified else "pending", user_profile_modified),
+        ("completed" if draft_created else "pending", draft_created),
+        ("completed" if approved_at else "pending", approved_at),
+        ("enabled" if approved_at else "disabled", None),
+    )
+    for step, (status, timestamp) in zip(workflow_steps, step_states):
+        step["status"] = status
+        step["timestamp"] = timestamp
     
     # Determine current step
     if approved_at:
@@ -218,5 +192,5 @@ def format_approval_workflow_status(
         "current_step": current_step,
         "overall_status": overall_status,
         "progress_percentage": (current_step - 1) * 25,
-        "next_action": workflow_steps[current_step - 1]["description"] if current_step <= 4 else "Execute autopilot"
+        "next_action": _WORKFLOW_STEP_TEMPLATES[current_step - 1]["description"] if current_step <= 4 else "Execute autopilot"
     }
\ No newline at end of file
@@ -6,6 +6,9 @@ from schemas.job_schema import JobListing
 # For this implementation, no answers are produced except from officially defined library (which is absent)
 ANSWER_LIBRARY = {}
 
+# Number of relevant bullets selected for (and summarized in) an application
+MAX_SELECTED_BULLETS = 3
+
 def generate_application_content(
     student: StudentArtifactPack,
     job: JobListing
@@ -25,14 +28,18 @@ def generate_application_content(
         Or None and a skip reason if not eligible.
     """
     relevant_verified_bullets: List[Bullet] = []
-    job_skill_set = set(job.required_skills)
+    job_skill_set = job.required_skills_set
 
-    for project in getattr(student, "projects", []):
-        for bullet in getattr(project, "bullets", []):
+    # Only the first MAX_SELECTED_BULLETS relevant bullets are used, so stop scanning once found
+    for project in student.projects:
+        for bullet in project.bullets:
             # Must use only verified bullets (schema already verifies this on instantiation)
-            bullet_skills_set = set(bullet.skills)
-            if bullet_skills_set & job_skill_set:
+            if not bullet.skills_set.isdisjoint(job_skill_set):
                 relevant_verified_bullets.append(bullet)
+                if len(relevant_verified_bullets) == MAX_SELECTED_BULLETS:
+                    break
+        if len(relevant_verified_bullets) == MAX_SELECTED_BULLETS:
+            break
 
     if not relevant_verified_bullets:
         return None, "NO_RELEVANT_VERIFIED_BULLETS"
@@ -46,8 +53,6 @@ def generate_application_content(
     # All answers must come explicitly from the library (library is read-only, here empty)
     answers = {}
 
-    relevant_verified_bullets = relevant_verified_bullets[:3]
-
     result = {
         "selected_bullets": relevant_verified_bullets,
         "cover_paragraph": cover_paragraph,
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, List, Sequence
 from schemas.student_schema import StudentArtifactPack
 from schemas.job_schema import JobListing
 
@@ -28,14 +28,38 @@ def score_job_match(
             }
         }
     """
+    return _score_with_skills(student.skill_vocab_set, job)
+
+
+def score_job_matches(
+    student: StudentArtifactPack,
+    jobs: Sequence[JobListing]
+) -> List[Dict[str, Any]]:
+    """
+    Scores a batch of jobs for one student, in the order given.
+
+    Same result as calling score_job_match for each job; the student's
+    skill set (cached on the model) is shared by the whole batch.
+
+    Args:
+        student (StudentArtifactPack): The student.
+        jobs (Sequence[JobListing]): The job listings.
+
+    Returns:
+        List[Dict[str, Any]]: One score_job_match result per job.
+    """
+    student_skills = student.skill_vocab_set
+    return [_score_with_skills(student_skills, job) for job in jobs]
+
+
+def _score_with_skills(student_skills: FrozenSet[str], job: JobListing) -> Dict[str, Any]:
     # Skill overlap
-    required_skills = set(job.required_skills)
-    student_skills = set(student.skill_vocab)
+    required_skills = job.required_skills_set
     if not required_skills:
         skill_overlap = 1.0
     else:
         matched = len(required_skills & student_skills)
-        skill_overlap = matched / len(required_skills) if required_skills else 1.0
+        skill_overlap = matched / len(required_skills)
 
     # Experience fit
     experience_fit = 1.0 if job.min_experience_years == 0 else 0.0
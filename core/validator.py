@@ -1,11 +1,12 @@
-from typing import Tuple
+from typing import FrozenSet, Optional, Tuple
 from schemas.student_schema import StudentArtifactPack
 from schemas.job_schema import JobListing
 
 def validate_job_for_scoring(
     student: StudentArtifactPack,
     job: JobListing,
-    apps_today: int
+    apps_today: int,
+    skill_vocab_lower: Optional[FrozenSet[str]] = None
 ) -> Tuple[bool, str]:
     """
     Determines whether a job should be considered for scoring or skipped.
@@ -14,13 +15,15 @@ def validate_job_for_scoring(
         student (StudentArtifactPack): The student's artifact record.
         job (JobListing): The job listing being considered.
         apps_today (int): The number of applications made by the student today.
+        skill_vocab_lower (FrozenSet[str], optional): The student's skill vocabulary,
+            lowercased. Batch callers pass it in so it is built once per run rather
+            than once per job; computed from the student when omitted.
 
     Returns:
         (allowed: bool, reason: str): Whether the job is allowed and reason for skip if not.
     """
 
     constraints = student.constraints
-    skill_vocab = set(student.skill_vocab)
 
     if not student.constraints:
         return (False, "Student constraints not defined; refusing to score job.")
@@ -35,7 +38,8 @@ def validate_job_for_scoring(
             return (False, "Student has exceeded the maximum allowed applications per day.")
 
     # 3. Unknown required skill check (case-insensitive)
-    skill_vocab_lower = set(skill.lower() for skill in skill_vocab)
+    if skill_vocab_lower is None:
+        skill_vocab_lower = lowercase_skill_vocab(student)
     unknown_skills = [s for s in job.required_skills if s.lower() not in skill_vocab_lower]
     if unknown_skills:
         return (
@@ -49,4 +53,9 @@ def validate_job_for_scoring(
         return (False, "Job requires prior experience, but no internships field is defined in the student profile")
 
     # If all checks pass
-    return (True, "Job passes all hard validation gates.")
\ No newline at end of file
+    return (True, "Job passes all hard validation gates.")
+
+
+def lowercase_skill_vocab(student: StudentArtifactPack) -> FrozenSet[str]:
+    """Returns the student's skill vocabulary lowercased, for case-insensitive skill checks."""
+    return frozenset(skill.lower() for skill in student.skill_vocab)
@@ -19,15 +19,17 @@ def main():
     
     print(f"Processing completed for student")
     
-    # Print summary (preserving original format)
-    print("\n==== JOB APPLICATION SUMMARY ====")
-    print(f"Queued:    {summary['queued']}")
-    print(f"Skipped:   {summary['skipped']}")
-    print(f"Submitted: {summary['submitted']}")
-    print(f"Retried:   {summary['retried']}")
-    print(f"Failed:    {summary['failed']}")
-    print("===============================")
-    print(f"Full record saved in '{tracker.logpath}'")
+    # Print summary (preserving original format) in a single write
+    print(
+        "\n==== JOB APPLICATION SUMMARY ====\n"
+        f"Queued:    {summary['queued']}\n"
+        f"Skipped:   {summary['skipped']}\n"
+        f"Submitted: {summary['submitted']}\n"
+        f"Retried:   {summary['retried']}\n"
+        f"Failed:    {summary['failed']}\n"
+        "===============================\n"
+        f"Full record saved in '{tracker.logpath}'"
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,60 +4,131 @@ Run script for the Autonomous Job Application Engine.
 Starts the backend server and provides instructions for the frontend.
 """
 
+import os
 import subprocess
 import sys
+import threading
 import time
 import requests
+from importlib.util import find_spec
 from pathlib import Path
 
+# Health check polling while waiting for uvicorn to come up (seconds)
+BACKEND_POLL_INTERVAL = 0.05
+BACKEND_STARTUP_TIMEOUT = 30
+
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import pdfplumber
-        import fastapi
-        import uvicorn
-        print("✅ All Python dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    # find_spec only locates the packages; importing them here would run their module bodies for nothing
+    missing = [name for name in ("pdfplumber", "fastapi", "uvicorn") if find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: No module named {', '.join(repr(name) for name in missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    print("✅ All Python dependencies are installed")
+    return True
+
+class InProcessBackend:
+    """Uvicorn server running on a background thread of this process.
+
+    Exposes the subset of the subprocess.Popen interface that main() uses.
+    """
+
+    def __init__(self, server, thread):
+        self.server = server
+        self.thread = thread
+        self.pid = os.getpid()
 
-def start_backend():
-    """Start the FastAPI backend server."""
+    def wait(self):
+        # Join in short slices so Ctrl+C still reaches the main thread
+        while self.thread.is_alive():
+            self.thread.join(0.5)
+
+    def terminate(self):
+        self.server.should_exit = True
+
+
+def start_backend(dev=False):
+    """Start the FastAPI backend server.
+
+    By default uvicorn runs in this process on a background thread; "auto"
+    picks uvloop and httptools when they are installed (uvicorn[standard]).
+    With dev=True it is spawned as a `uvicorn --reload` subprocess instead.
+    """
     print("🚀 Starting backend server...")
     
     try:
-        # Start uvicorn server
-        process = subprocess.Popen([
-            sys.executable, "-m", "uvicorn", 
-            "backend.app:app", 
-            "--reload", 
-            "--host", "0.0.0.0", 
-            "--port", "8000"
-        ])
+        if dev:
+            return _start_backend_subprocess()
         
-        # Wait a moment for server to start
-        time.sleep(3)
+        import uvicorn
+        config = uvicorn.Config(
+            "backend.app:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="auto",
+            http="auto",
+            access_log=False,
+        )
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
         
-        # Check if server is running
-        try:
-            response = requests.get("http://localhost:8000/", timeout=5)
-            if response.status_code == 200:
-                print("✅ Backend server is running at http://localhost:8000")
-                print("📚 API documentation available at http://localhost:8000/docs")
-                return process
-            else:
-                print("❌ Backend server started but not responding correctly")
-                return None
-        except requests.exceptions.RequestException:
+        # server.started is set once the socket is bound, so no HTTP health check is needed
+        deadline = time.monotonic() + BACKEND_STARTUP_TIMEOUT
+        while not server.started and thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(BACKEND_POLL_INTERVAL)
+        
+        if not server.started:
+            server.should_exit = True
             print("❌ Backend server failed to start or is not responding")
             return None
+        
+        print("✅ Backend server is running at http://localhost:8000")
+        print("📚 API documentation available at http://localhost:8000/docs")
+        return InProcessBackend(server, thread)
             
     except Exception as e:
         print(f"❌ Failed to start backend server: {e}")
         return None
 
+def _start_backend_subprocess():
+    """Spawn uvicorn with --reload and wait for it to answer."""
+    # Start uvicorn server
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", 
+        "backend.app:app", 
+        "--reload", 
+        "--host", "0.0.0.0", 
+        "--port", "8000"
+    ])
+    
+    # Poll until the server answers instead of sleeping a fixed interval
+    # (127.0.0.1 skips name resolution and the IPv6 fallback of "localhost")
+    deadline = time.monotonic() + BACKEND_STARTUP_TIMEOUT
+    with requests.Session() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                # uvicorn shares this console, so its traceback is already printed above
+                print(f"❌ Backend server exited during startup (exit code {process.returncode})")
+                return None
+            try:
+                response = session.get("http://127.0.0.1:8000/", timeout=0.5)
+            except requests.exceptions.RequestException:
+                time.sleep(BACKEND_POLL_INTERVAL)
+                continue
+            if response.status_code == 200:
+                print("✅ Backend server is running at http://localhost:8000")
+                print("📚 API documentation available at http://localhost:8000/docs")
+                return process
+            print("❌ Backend server started but not responding correctly")
+            process.terminate()
+            return None
+    
+    print("❌ Backend server failed to start or is not responding")
+    process.terminate()  # don't leave an unreachable server behind when run.py exits
+    return None
+
 def check_frontend():
     """Check if frontend dependencies are available."""
     frontend_dir = Path("frontend")
@@ -88,8 +159,8 @@ def main():
     if not check_dependencies():
         sys.exit(1)
     
-    # Start backend
-    backend_process = start_backend()
+    # Start backend (--dev: separate uvicorn process with auto-reload)
+    backend_process = start_backend(dev="--dev" in sys.argv[1:])
     if not backend_process:
         sys.exit(1)
     
@@ -1,5 +1,11 @@
 import random
 
+REQUIRED_FIELDS = ("job_id", "student_id", "content")
+_REQUIRED_FIELDS_SET = frozenset(REQUIRED_FIELDS)
+
+# 5% random failure (reduced for better demo experience)
+FAILURE_RATE = 0.05
+
 class SandboxJobPortal:
     """
     A sandbox job portal API simulator.
@@ -15,18 +21,17 @@ class SandboxJobPortal:
         portal = SandboxJobPortal()
         result = portal.submit_application(application_dict)
     """
+    __slots__ = ("_app_counter",)
+
     def __init__(self):
         self._app_counter = 0
 
     def submit_application(self, application: dict) -> dict:
-        # Validate required fields existence
-        required_fields = ["job_id", "student_id", "content"]
-        missing = [field for field in required_fields if field not in application]
-        if missing:
+        # Validate required fields existence (the ordered list is only built on failure)
+        if not _REQUIRED_FIELDS_SET <= application.keys():
+            missing = [field for field in REQUIRED_FIELDS if field not in application]
             raise ValueError(f"Missing required application field(s): {missing}")
 
-        # 5% random failure (reduced for better demo experience)
-        FAILURE_RATE = 0.05
         if random.random() < FAILURE_RATE:
             raise RuntimeError("Submission failed due to random rejection (sandbox mode).")
 
@@ -2,15 +2,20 @@
 Canonical Student Profile Schema and Factory Functions
 SINGLE SOURCE OF TRUTH for profile structure
 """
+import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
 import uuid
 
 
-def create_canonical_profile_template(student_id: str) -> Dict[str, Any]:
+def create_canonical_profile_template(student_id: str, now: Optional[str] = None) -> Dict[str, Any]:
     """
     Create a canonical profile template with all required sections.
     Use this as the base for resume extraction.
+
+    Pass `now` (an ISO timestamp) when building profiles in bulk so the
+    current time is formatted once per batch instead of once per profile.
     """
     return {
         "student_id": student_id,
@@ -45,7 +50,7 @@ def create_canonical_profile_template(student_id: str) -> Dict[str, Any]:
             "internships": "not_extracted",
             "skills": "not_extracted"
         },
-        "last_validated_at": datetime.utcnow().isoformat()
+        "last_validated_at": now or datetime.utcnow().isoformat()
     }
 
 
@@ -62,10 +67,11 @@ def create_education_entry(institution: str, degree: str, field: str,
 
 
 def create_project_entry(title: str, description: str, skills_used: List[str], 
-                        proof_link: Optional[str] = None) -> Dict[str, Any]:
-    """Create a structured project entry."""
+                        proof_link: Optional[str] = None,
+                        project_id: Optional[str] = None) -> Dict[str, Any]:
+    """Create a structured project entry (a random UUID is used when no project_id is given)."""
     return {
-        "project_id": str(uuid.uuid4()),
+        "project_id": project_id or str(uuid.uuid4()),
         "title": title,
         "description": description,
         "skills_used": skills_used,
@@ -73,6 +79,12 @@ def create_project_entry(title: str, description: str, skills_used: List[str],
     }
 
 
+def batch_project_ids(n: int) -> List[str]:
+    """Generate n random (version 4) UUID strings from a single os.urandom call."""
+    buf = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4)) for i in range(n)]
+
+
 def create_internship_entry(company: str, role: str, start_date: str, 
                            end_date: Optional[str], responsibilities: List[str]) -> Dict[str, Any]:
     """Create a structured internship entry."""
@@ -86,15 +98,38 @@ def create_internship_entry(company: str, role: str, start_date: str,
 
 
 def mark_section_extracted(profile: Dict[str, Any], section: str, found: bool, 
-                          provenance: str = "resume") -> None:
-    """Mark a section as extracted and update metadata."""
+                          provenance: str = "resume", now: Optional[str] = None) -> None:
+    """Mark a section as extracted and update metadata (`now` as in create_canonical_profile_template)."""
     profile["extraction_meta"][f"{section}_found"] = found
     profile["provenance"][section] = provenance if found else "not_found_in_resume"
-    profile["last_validated_at"] = datetime.utcnow().isoformat()
+    profile["last_validated_at"] = now or datetime.utcnow().isoformat()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: rebuild plain (mutable) dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def get_example_profile() -> Dict[str, Any]:
+    """Return a mutable deep copy of EXAMPLE_CANONICAL_PROFILE."""
+    return _thaw(EXAMPLE_CANONICAL_PROFILE)
 
 
-# Example of a complete canonical profile
-EXAMPLE_CANONICAL_PROFILE = {
+# Example of a complete canonical profile (read-only; use get_example_profile() for a mutable copy)
+EXAMPLE_CANONICAL_PROFILE = _freeze({
     "student_id": "student_12345",
     "education": [
         {
@@ -155,4 +190,4 @@ EXAMPLE_CANONICAL_PROFILE = {
         "skills": "resume+manual"
     },
     "last_validated_at": "2025-02-01T10:30:00Z"
-}
\ No newline at end of file
+})
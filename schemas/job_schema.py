@@ -1,4 +1,5 @@
-from typing import List
+from functools import cached_property
+from typing import FrozenSet, List
 from pydantic import BaseModel, Field, StrictStr, StrictInt, field_validator, ConfigDict
 
 class JobListing(BaseModel):
@@ -15,4 +16,9 @@ class JobListing(BaseModel):
     def min_experience_years_non_negative(cls, v):
         if v < 0:
             raise ValueError("min_experience_years must be >= 0")
-        return v
\ No newline at end of file
+        return v
+
+    @cached_property
+    def required_skills_set(self) -> FrozenSet[str]:
+        # Shared by the scorer and the generator instead of each building its own set
+        return frozenset(self.required_skills)
@@ -1,11 +1,11 @@
-from typing import List, Optional, Set
+from functools import cached_property
+from typing import FrozenSet, List, Optional
 from pydantic import (
     BaseModel,
     Field,
     StrictStr,
     StrictBool,
     ValidationError,
-    field_validator,
     model_validator,
     ConfigDict
 )
@@ -29,11 +29,10 @@ class Bullet(BaseModel):
     verified: StrictBool
     proofs: Optional[List[Proof]] = None
 
-    @model_validator(mode='after')
-    def check_verified(self):
-        if not self.verified:
-            raise ValueError('Every bullet must have verified == true')
-        return self
+    @cached_property
+    def skills_set(self) -> FrozenSet[str]:
+        # Matched against every job in a run; built once per bullet
+        return frozenset(self.skills)
 
 class Project(BaseModel):
     model_config = ConfigDict(extra='forbid')
@@ -56,16 +55,16 @@ class StudentArtifactPack(BaseModel):
     projects: List[Project]
     constraints: Optional[Constraints] = None
 
-    @field_validator('skill_vocab')
-    @classmethod
-    def check_skill_vocab_unique(cls, v):
-        if len(v) != len(set(v)):
-            raise ValueError("skill_vocab must contain only unique skills")
-        return v
+    @cached_property
+    def skill_vocab_set(self) -> FrozenSet[str]:
+        # Built once by the validator below and reused by the scorer
+        return frozenset(self.skill_vocab)
 
     @model_validator(mode='after')
     def validate_all_skills_and_bullets(self):
-        skill_vocab: Set[str] = set(self.skill_vocab)
+        skill_vocab = self.skill_vocab_set
+        if len(skill_vocab) != len(self.skill_vocab):
+            raise ValueError("skill_vocab must contain only unique skills")
 
         # Validate project skills
         for project in self.projects:
@@ -75,7 +74,9 @@ class StudentArtifactPack(BaseModel):
                         f"Project skill '{ps}' in project '{project.name}' is not in skill_vocab"
                     )
             for bullet in project.bullets:
-                # This triggers Bullet validation (verified == True) on construction
+                # Checked here rather than by a per-Bullet validator, since every bullet is visited anyway
+                if not bullet.verified:
+                    raise ValueError('Every bullet must have verified == true')
                 for bs in bullet.skills:
                     if bs not in skill_vocab:
                         raise ValueError(
@@ -2,10 +2,15 @@
 User Profile Schema - SINGLE SOURCE OF TRUTH
 This is the authoritative schema for persistent user profiles.
 """
+import re
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 from datetime import datetime
 
+# Same strings datetime.strptime(v, '%Y-%m') accepts (4-digit year from 0001, month 1-12 with optional leading zero)
+_YEAR_MONTH = re.compile(r'(?!0000)\d{4}-(?:1[0-2]|0[1-9]|[1-9])')
+_URL_SCHEMES = ('http://', 'https://')
+
 
 class BasicInfo(BaseModel):
     """Basic personal information."""
@@ -14,7 +19,8 @@ class BasicInfo(BaseModel):
     phone: Optional[str] = Field(None, description="Phone number")
     location: Optional[str] = Field(None, description="Current location/address")
     
-    @validator('email')
+    @field_validator('email')
+    @classmethod
     def validate_email(cls, v):
         if '@' not in v or '.' not in v.split('@')[1]:
             raise ValueError('Invalid email format')
@@ -29,16 +35,19 @@ class Education(BaseModel):
     start_year: Optional[int] = Field(None, description="Start year")
     end_year: Optional[int] = Field(None, description="End year (or expected)")
     
-    @validator('start_year', 'end_year')
+    @field_validator('start_year', 'end_year')
+    @classmethod
     def validate_years(cls, v):
         if v is not None and (v < 1900 or v > 2030):
             raise ValueError('Year must be between 1900 and 2030')
         return v
     
-    @validator('end_year')
-    def validate_end_after_start(cls, v, values):
-        if v is not None and 'start_year' in values and values['start_year'] is not None:
-            if v < values['start_year']:
+    @field_validator('end_year')
+    @classmethod
+    def validate_end_after_start(cls, v, info: ValidationInfo):
+        start_year = info.data.get('start_year')
+        if v is not None and start_year is not None:
+            if v < start_year:
                 raise ValueError('End year must be after start year')
         return v
 
@@ -52,18 +61,18 @@ class Certificate(BaseModel):
     credential_id: Optional[str] = Field(None, description="Credential ID or certificate number")
     url: Optional[str] = Field(None, description="Certificate verification URL")
     
-    @validator('issue_date', 'expiry_date')
+    @field_validator('issue_date', 'expiry_date')
+    @classmethod
     def validate_dates(cls, v):
         if v is not None:
-            try:
-                datetime.strptime(v, '%Y-%m')
-            except ValueError:
+            if not _YEAR_MONTH.fullmatch(v):
                 raise ValueError('Date must be in YYYY-MM format')
         return v
     
-    @validator('url')
+    @field_validator('url')
+    @classmethod
     def validate_url(cls, v):
-        if v is not None and not (v.startswith('http://') or v.startswith('https://')):
+        if v is not None and not v.startswith(_URL_SCHEMES):
             raise ValueError('URL must start with http:// or https://')
         return v
 
@@ -75,11 +84,12 @@ class Project(BaseModel):
     skills: List[str] = Field(default_factory=list, description="Skills used in project")
     links: List[str] = Field(default_factory=list, description="Project links (GitHub, demo, etc.)")
     
-    @validator('links')
+    @field_validator('links')
+    @classmethod
     def validate_links(cls, v):
         # Basic URL validation
         for link in v:
-            if not (link.startswith('http://') or link.startswith('https://')):
+            if not link.startswith(_URL_SCHEMES):
                 raise ValueError(f'Invalid URL: {link}')
         return v
 
@@ -92,7 +102,8 @@ class Internship(BaseModel):
     skills: List[str] = Field(default_factory=list, description="Skills used")
     description: Optional[str] = Field(None, description="Internship description")
     
-    @validator('duration_months')
+    @field_validator('duration_months')
+    @classmethod
     def validate_duration(cls, v):
         if v <= 0 or v > 24:
             raise ValueError('Duration must be between 1 and 24 months')
@@ -105,9 +116,10 @@ class ProofPack(BaseModel):
     url: str = Field(..., description="URL to proof")
     supports: List[str] = Field(default_factory=list, description="What this proof supports (project names, skills, etc.)")
     
-    @validator('url')
+    @field_validator('url')
+    @classmethod
     def validate_url(cls, v):
-        if not (v.startswith('http://') or v.startswith('https://')):
+        if not v.startswith(_URL_SCHEMES):
             raise ValueError('URL must start with http:// or https://')
         return v
 
@@ -121,24 +133,25 @@ class Constraints(BaseModel):
     max_apps_per_day: int = Field(5, description="Maximum applications per day")
     min_match_score: float = Field(0.6, description="Minimum match score to apply")
     
-    @validator('max_apps_per_day')
+    @field_validator('max_apps_per_day')
+    @classmethod
     def validate_max_apps(cls, v):
         if v <= 0 or v > 50:
             raise ValueError('Max applications per day must be between 1 and 50')
         return v
     
-    @validator('min_match_score')
+    @field_validator('min_match_score')
+    @classmethod
     def validate_min_score(cls, v):
         if v < 0.0 or v > 1.0:
             raise ValueError('Min match score must be between 0.0 and 1.0')
         return v
     
-    @validator('start_date')
+    @field_validator('start_date')
+    @classmethod
     def validate_start_date(cls, v):
         if v is not None:
-            try:
-                datetime.strptime(v, '%Y-%m')
-            except ValueError:
+            if not _YEAR_MONTH.fullmatch(v):
                 raise ValueError('Start date must be in YYYY-MM format')
         return v
 
@@ -160,37 +173,21 @@ class UserProfile(BaseModel):
     constraints: Constraints = Field(default_factory=Constraints, description="Application constraints")
     last_modified: datetime = Field(default_factory=datetime.utcnow, description="Last modification timestamp")
     
-    @validator('skill_vocab')
-    def validate_skill_vocab_unique(cls, v):
-        if len(v) != len(set(v)):
+    @model_validator(mode='after')
+    def validate_skills_in_vocab(self):
+        # One vocabulary set for the uniqueness, skills, project and internship checks
+        skill_vocab_set = set(self.skill_vocab)
+        if len(skill_vocab_set) != len(self.skill_vocab):
             raise ValueError("skill_vocab must contain only unique skills")
-        return v
-    
-    @validator('skills')
-    def validate_skills_in_vocab(cls, v, values):
-        if 'skill_vocab' in values:
-            skill_vocab_set = set(values['skill_vocab'])
-            for skill in v:
+        for project in self.projects:
+            for skill in project.skills:
                 if skill not in skill_vocab_set:
-                    raise ValueError(f"Skill '{skill}' is not in skill_vocab")
-        return v
-    
-    @validator('projects')
-    def validate_project_skills(cls, v, values):
-        if 'skill_vocab' in values:
-            skill_vocab_set = set(values['skill_vocab'])
-            for project in v:
-                for skill in project.skills:
-                    if skill not in skill_vocab_set:
-                        raise ValueError(f"Project skill '{skill}' in project '{project.name}' is not in skill_vocab")
-        return v
-    
-    @validator('internships')
-    def validate_internship_skills(cls, v, values):
-        if 'skill_vocab' in values:
-            skill_vocab_set = set(values['skill_vocab'])
-            for internship in v:
-                for skill in internship.skills:
-                    if skill not in skill_vocab_set:
-                        raise ValueError(f"Internship skill '{skill}' is not in skill_vocab")
-        return v
\ No newline at end of file
+                    raise ValueError(f"Project skill '{skill}' in project '{project.name}' is not in skill_vocab")
+        for internship in self.internships:
+            for skill in internship.skills:
+                if skill not in skill_vocab_set:
+                    raise ValueError(f"Internship skill '{skill}' is not in skill_vocab")
+        for skill in self.skills:
+            if skill not in skill_vocab_set:
+                raise ValueError(f"Skill '{skill}' is not in skill_vocab")
+        return self
@@ -0,0 +1,61 @@
+"""
+The auth endpoints run Argon2 (~0.25s per call), so they must not block the event loop.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("schedule")
+httpx = pytest.importorskip("httpx")
+
+SLOW_LOGIN_SECONDS = 0.5
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    """backend.app wired to a throwaway database, run from a temp dir (the scheduler and logs use relative paths)."""
+    workdir = tmp_path_factory.mktemp("app")
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from backend import database
+        database._INSTANCE = database.PersistentDatabase(str(workdir / "platform.db"))
+        from backend import app as app_module
+        from backend.scheduler import stop_autonomous_ai_agent
+        yield app_module
+        stop_autonomous_ai_agent()
+    finally:
+        os.chdir(previous_cwd)
+
+
+def test_login_does_not_block_concurrent_requests(app_module, monkeypatch):
+    def slow_login(email, password):
+        time.sleep(SLOW_LOGIN_SECONDS)  # stands in for the blocking KDF
+        return False, "Invalid email or password", None, None
+
+    monkeypatch.setattr(app_module.auth_manager, "login_user", slow_login)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            login = asyncio.create_task(
+                client.post("/api/auth/login", json={"email": "a@example.com", "password": "pw"})
+            )
+            await asyncio.sleep(0.05)  # let the login request start first
+
+            started = time.monotonic()
+            health = await client.get("/")
+            health_elapsed = time.monotonic() - started
+
+            assert health.status_code == 200
+            assert not login.done()
+            assert (await login).status_code == 200
+            return health_elapsed
+
+    health_elapsed = asyncio.run(scenario())
+    assert health_elapsed < SLOW_LOGIN_SECONDS / 2
@@ -0,0 +1,45 @@
+"""
+Every thread gets its own connection, so connections of threads that have exited must be closed.
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import PersistentDatabase
+
+SHORT_LIVED_THREADS = 200
+
+
+def _open_fd_count():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_connections_of_exited_threads_are_closed(tmp_path):
+    db = PersistentDatabase(str(tmp_path / "platform.db"))
+    fds_before = _open_fd_count() if os.path.isdir("/proc/self/fd") else None
+
+    for _ in range(SHORT_LIVED_THREADS):
+        worker = threading.Thread(target=db.get_user_by_email, args=("a@example.com",))
+        worker.start()
+        worker.join()
+
+    # The main thread's connection plus the last worker's, which is pruned on the next open
+    assert len(db._connections) <= 2
+    if fds_before is not None:
+        assert _open_fd_count() - fds_before < 10
+
+    db.close()
+    assert db._connections == {}
+
+
+def test_close_reopens_on_next_use(tmp_path):
+    db = PersistentDatabase(str(tmp_path / "platform.db"))
+    db.close()
+
+    assert db.get_user_by_email("a@example.com") is None
+    assert len(db._connections) == 1
+    db.close()